@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=['psutil'], # imported lazily by SCRAPER.memory_mb
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,53 @@
+import os
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from export_results import _write_frame, _default_output_path
+from trace_log import tracer
+
+# Post-scrape analysis of the typed DB/EX frames: every exercise is matched to the conversion price in
+# force on its date (the latest EX reset on or before it, same title), with running totals per title.
+#   prc_date / conv_price  - the reset in force and its price (cur_prc); empty before the first reset
+#   price_gap              - exc_price - conv_price, non-zero when the grid price disagrees with EX
+#   cum_shares / cum_amount - exercised so far for the title, in date order
+#   remaining_amount       - issue amount not yet converted after this row (issue amount from LIST column C)
+#   overhang_shares        - shares the remaining amount converts into at the price in force (exc_price
+#                            before the first reset); both are left empty for titles without an issue amount
+
+ANALYSIS_COLUMNS = ["title", "date", "exc_shares", "exc_price", "prc_date", "conv_price", "price_gap",
+                    "cum_shares", "cum_amount", "remaining_amount", "overhang_shares"]
+
+def exercise_overhang(db, ex, issue_amounts = None):
+    # db: DB frame (title, date, exc_amount, exc_shares, exc_price, ...), ex: EX frame (title, date, prv_prc, cur_prc),
+    # issue_amounts: {title: issue amount}
+    exercises = db.dropna(subset=["title", "date"]).sort_values(["date", "title"], kind="stable")
+    resets = ex.dropna(subset=["title", "date"])[["title", "date", "cur_prc"]]
+    resets = resets.rename(columns={"cur_prc": "conv_price"}).assign(prc_date=lambda df: df["date"])
+    resets = resets.sort_values(["date", "title"], kind="stable")
+    df = pd.merge_asof(exercises, resets, on="date", by="title", direction="backward")
+    df = df.sort_values(["title", "date"], kind="stable", ignore_index=True)
+    df["price_gap"] = df["exc_price"] - df["conv_price"]
+    by_title = df.groupby("title", sort=False)
+    df["cum_shares"] = by_title["exc_shares"].cumsum()
+    df["cum_amount"] = by_title["exc_amount"].cumsum()
+    # Only what is known on the row's date: the issue size less what has been converted so far
+    df["remaining_amount"] = df["title"].map(issue_amounts or {}).astype("float64") - df["cum_amount"]
+    df["overhang_shares"] = (df["remaining_amount"] / df["conv_price"].fillna(df["exc_price"])).round()
+    return df[ANALYSIS_COLUMNS]
+
+def save_analysis(db, ex, output_path: str = None, sheet_name: str = "ANALYSIS", issue_amounts = None) -> str:
+    # Write exercise_overhang(db, ex, issue_amounts) to its own sheet, created on first use and rewritten afterwards
+    output_path = output_path or _default_output_path()
+    with tracer.span("analysis", rows=len(db)):
+        df = exercise_overhang(db, ex, issue_amounts)
+    wb = load_workbook(output_path)
+    if sheet_name in wb.sheetnames:
+        ws = wb[sheet_name]
+        ws.delete_rows(1, ws.max_row)
+    else: ws = wb.create_sheet(sheet_name)
+    with tracer.span("analysis_write", rows=len(df)):
+        _write_frame(ws, df, ANALYSIS_COLUMNS)
+        wb.save(output_path)
+    wb.close()
+    return os.path.abspath(output_path)
@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+from openpyxl import Workbook
+
+import seibro_scraper
+from export_results import EXCEL_WRITER
+from mock_seibro import MOCK_DATA, serve
+
+# Offline benchmark against mock_seibro: seconds per company, WebDriver commands per grid page
+# and Excel write time for each LIST size.
+#   python benchmark.py --sizes 10,100,1000 --workers 3 --latency 0.05
+
+def make_workbook(path, titles):
+    # results.xlsx with a LIST sheet and empty DB/EX sheets, like the one shipped to users
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "LIST"
+    ws.append(["keyword", "company"])
+    for title in titles: ws.append(title)
+    wb.create_sheet("DB")
+    wb.create_sheet("EX")
+    wb.save(path)
+
+def run_case(issues, args):
+    data = MOCK_DATA(issues, bonds_per_company=args.bonds_per_company, details_rows=args.details_rows, prc_rows=args.prc_rows)
+    server, base_url = serve(data, latency=args.latency, api=args.datalist, pager_base=args.pager_base)
+    saved_sysconst = dict(seibro_scraper.SYSCONST)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        seibro_scraper.SYSCONST["details_url"] = f"{base_url}/websquare/control.jsp?w2xPath=/IPORTAL/user/bond/BIP_CNTS03024V.xml&menuNo=416"
+        seibro_scraper.SYSCONST["prc_url"] = f"{base_url}/websquare/control.jsp?w2xPath=/IPORTAL/user/bond/BIP_CNTS03025V.xml&menuNo=417"
+        urls = [seibro_scraper.get("details_url"), seibro_scraper.get("prc_url")]
+        titles = data.list_titles()
+        base_config = {"from_date": "20210101", "to_date": data.last_date, "headless": True, "display": False}
+
+        stats = {}
+        start = time.perf_counter()
+        results = seibro_scraper.run_scrape_pool(base_config, titles, urls, workers=args.workers,
+                                       paired=args.paired, stats=stats)
+        scrape_seconds = time.perf_counter() - start
+
+        expected = sum(len(data.records(screen, issue["isin"])) for issue in data.issues for screen in ("details", "prc"))
+        scraped = sum(len(rows) for url in urls for rows in results[url] if rows)
+        failed = sum(1 for url in urls for rows in results[url] if rows is None)
+
+        path = os.path.join(tmp_dir, "results.xlsx")
+        make_workbook(path, titles)
+        writer = EXCEL_WRITER(output_path=path)
+        for url, sheet in zip(urls, ("DB", "EX")):
+            for rows in results[url]:
+                if rows: writer.add(rows, sheet)
+        start = time.perf_counter()
+        writer.close()
+        excel_seconds = time.perf_counter() - start
+
+        pages = stats.get("pages", 0)
+        return {
+            "issues": issues,
+            "workers": args.workers,
+            "scrape_seconds": round(scrape_seconds, 3),
+            "seconds_per_company": round(scrape_seconds / issues, 3),
+            "webdriver_commands": stats.get("commands", 0),
+            "pages": pages,
+            "commands_per_page": round(stats.get("commands", 0) / pages, 1) if pages else None,
+            "excel_write_seconds": round(excel_seconds, 3),
+            "rows": scraped,
+            "rows_expected": expected,
+            "failed": failed,
+        }
+    finally:
+        seibro_scraper.SYSCONST.clear()
+        seibro_scraper.SYSCONST.update(saved_sysconst)
+        server.shutdown()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def measure_page_loads(urls, block, loads = 3):
+    # Bytes transferred and seconds until the search button is usable, per url, with blocking on or off
+    saved = seibro_scraper.SYSCONST["block_resources"]
+    seibro_scraper.SYSCONST["block_resources"] = block
+    scraper = seibro_scraper.SCRAPER({}, headless=True)
+    try:
+        scraper.setup()
+        results = []
+        for url in urls:
+            for _ in range(loads):
+                scraper.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+                start = time.perf_counter()
+                scraper.driver.get(url)
+                scraper._wait_page_ready()
+                seconds = time.perf_counter() - start
+                transferred = scraper.driver.execute_script(
+                    """
+                    var entries = performance.getEntriesByType("navigation").concat(performance.getEntriesByType("resource"));
+                    var total = 0;
+                    for (var i = 0; i < entries.length; i++) total += entries[i].transferSize || 0;
+                    return [total, entries.length];
+                    """
+                )
+                results.append({"url": url, "seconds": seconds, "bytes": transferred[0], "requests": transferred[1]})
+        return results
+    finally:
+        scraper.cleanup()
+        seibro_scraper.SYSCONST["block_resources"] = saved
+
+def run_resource_case(args):
+    # Page-load cost of both screens before/after resource blocking, on the mock or (--live) the real site
+    server = None
+    if args.live: urls = [seibro_scraper.get("details_url"), seibro_scraper.get("prc_url")]
+    else:
+        server, base_url = serve(MOCK_DATA(1), latency=args.latency)
+        urls = [f"{base_url}/websquare/control.jsp?w2xPath=/IPORTAL/user/bond/BIP_CNTS03024V.xml&menuNo=416",
+                f"{base_url}/websquare/control.jsp?w2xPath=/IPORTAL/user/bond/BIP_CNTS03025V.xml&menuNo=417"]
+    try:
+        report = []
+        for block in (False, True):
+            loads = measure_page_loads(urls, block)
+            result = {
+                "block_resources": block,
+                "seconds_per_load": round(sum(l["seconds"] for l in loads) / len(loads), 3),
+                "bytes_per_load": sum(l["bytes"] for l in loads) // len(loads),
+                "requests_per_load": round(sum(l["requests"] for l in loads) / len(loads), 1),
+            }
+            report.append(result)
+            print(f"blocking {'on ' if block else 'off'} | {result['seconds_per_load']:>6.3f} s/load | "
+                  f"{result['bytes_per_load']:>10,} bytes/load | {result['requests_per_load']:>5.1f} requests/load")
+        return report
+    finally:
+        if server: server.shutdown()
+
+def run_benchmark(argv = None):
+    parser = argparse.ArgumentParser(description="Offline SEIBRO scraper benchmark")
+    parser.add_argument("--sizes", default="10,100,1000", help="comma separated LIST sizes")
+    parser.add_argument("--workers", type=int, default=seibro_scraper.get("workers"))
+    parser.add_argument("--paired", action="store_true", help="scrape both screens of an issue at once")
+    parser.add_argument("--datalist", action="store_true", help="expose the grid DataList API in the mock page")
+    parser.add_argument("--latency", type=float, default=0.05, help="mock server delay per request (s)")
+    parser.add_argument("--bonds-per-company", type=int, default=1)
+    parser.add_argument("--details-rows", type=int, default=40, help="a multiple of 15 ends on a full page")
+    parser.add_argument("--pager-base", type=int, choices=[0, 1], help="give the mock page a gridPaging component counting from 0 or 1")
+    parser.add_argument("--prc-rows", type=int, default=5)
+    parser.add_argument("--resources", action="store_true", help="only compare page loads with and without resource blocking")
+    parser.add_argument("--live", action="store_true", help="with --resources: load the real SEIBRO screens")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    if args.resources:
+        report = run_resource_case(args)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+        return report
+
+    report = []
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        result = run_case(size, args)
+        report.append(result)
+        print(f"{result['issues']:>5} issues | {result['seconds_per_company']:>7.3f} s/company | "
+              f"{result['commands_per_page'] or 0:>6.1f} cmds/page | excel {result['excel_write_seconds']:>7.3f} s | "
+              f"rows {result['rows']}/{result['rows_expected']} | failed {result['failed']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+    return report
+
+if __name__ == "__main__":
+    run_benchmark(sys.argv[1:])
@@ -0,0 +1,79 @@
+import sys
+import json
+import time
+import signal
+import argparse
+import contextlib
+
+from pipeline import run_pipeline, export_from_store, run_schedule
+
+# Headless entry point for batch servers and cron: same pipeline as the GUI, without tkinter.
+# Every event is printed to stdout as one JSON line.
+#   python cli.py --output /data/results.xlsx --workers 4 --from-date 20240101
+#   python cli.py --output /data/results.xlsx --export     (DB/EX from results.sqlite, no scraping)
+#   python cli.py --output /data/results.xlsx --schedule --rpm 30     (refresh continuously until stopped)
+# Exit codes: 0 completed (or --schedule stopped), 1 error, 2 empty LIST, 3 some issues failed, 130 interrupted.
+
+# stdout carries only the JSON events; the scraper modules' print() debug output goes to stderr
+_stdout = sys.stdout
+
+def _emit(event, **fields):
+    print(json.dumps(dict(fields, event=event, time=time.strftime("%Y-%m-%dT%H:%M:%S")), ensure_ascii=False), file=_stdout, flush=True)
+
+def main(argv = None):
+    with contextlib.redirect_stdout(sys.stderr):
+        return _main(argv)
+
+def _main(argv):
+    parser = argparse.ArgumentParser(description="SEIBRO scraper (headless batch mode)")
+    parser.add_argument("--output", help="results.xlsx with the LIST sheet (default: next to the program)")
+    parser.add_argument("--workers", type=int, help="parallel browser sessions")
+    parser.add_argument("--from-date", default="20210101", help="YYYYMMDD")
+    parser.add_argument("--to-date", help="YYYYMMDD (default: today)")
+    parser.add_argument("--paired", action="store_true", default=None, help="scrape both screens of an issue at once")
+    parser.add_argument("--full-refresh", action="store_true", default=None, help="ignore cached watermarks")
+    parser.add_argument("--no-resume", dest="resume", action="store_false", default=None,
+                        help="start over instead of continuing an interrupted run from its journal")
+    parser.add_argument("--export", action="store_true", help="only rewrite DB/EX from the result store for the LIST titles")
+    parser.add_argument("--schedule", action="store_true", help="keep refreshing issues, most stale and active first")
+    parser.add_argument("--rpm", type=float, help="with --schedule: requests per minute budget")
+    args = parser.parse_args(argv)
+
+    if args.export:
+        try: _emit("done", status="exported", path=export_from_store(_emit, args.output))
+        except Exception as e:
+            _emit("error", message=str(e))
+            return 1
+        return 0
+
+    running = [True]
+    def stop(signum, frame):
+        running[0] = False
+        _emit("status", status="stopping", signal=signum)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    if args.schedule:
+        try:
+            result = run_schedule(_emit, is_running=lambda: running[0], output_path=args.output, workers=args.workers,
+                                  from_date=args.from_date, requests_per_minute=args.rpm)
+        except Exception as e:
+            _emit("error", message=str(e))
+            return 1
+        _emit("done", **result)
+        return 2 if result["status"] == "empty" else 0
+
+    try:
+        result = run_pipeline(_emit, is_running=lambda: running[0], output_path=args.output, workers=args.workers,
+                              from_date=args.from_date, to_date=args.to_date, paired=args.paired, full_refresh=args.full_refresh, resume=args.resume)
+    except Exception as e:
+        _emit("error", message=str(e))
+        return 1
+    _emit("done", **{k: v for k, v in result.items() if k != "summary"})
+    if result["status"] == "empty": return 2
+    if result["status"] == "stopped": return 130
+    if result["failed"]: return 3
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,26 +1,78 @@
 import os
 import sys
+import csv
 from numpy import column_stack
 import pandas as pd
 from openpyxl import load_workbook
 
+from trace_log import tracer
+
 def _default_output_path(filename: str = "results.xlsx") -> str:
     # Get the default output path
 	if getattr(sys, "frozen", False): base_dir = os.path.dirname(sys.executable)
 	else: base_dir = os.path.dirname(os.path.abspath(__file__))
 	return os.path.join(base_dir, filename)
 
+SHEET_COLUMNS = {
+    "DB": ["title", "date", "exc_amount", "exc_shares", "exc_price", "listing_date"],
+    "EX": ["title", "date", "prv_prc", "cur_prc"],
+}
+
+# How typed_frame converts each column, and the columns that identify one record
+SHEET_TYPES = {
+    "DB": {"date": "date", "exc_amount": "float", "exc_shares": "int", "exc_price": "float", "listing_date": "date"},
+    "EX": {"date": "date", "prv_prc": "float", "cur_prc": "float"},
+}
+SHEET_KEYS = {
+    "DB": ["title", "date", "exc_shares", "listing_date"],
+    "EX": ["title", "date", "prv_prc", "cur_prc"],
+}
+
+def typed_frame(rows, sheet_name: str):
+    # Raw grid rows ("1,234", "2025/09/09") -> (typed frame without duplicates, {"parse_failures", "duplicates"}).
+    # Whole columns are converted at once: datetime64 dates, Int64 shares, float64 amounts and prices.
+    # A value that does not parse becomes NaT/NA and is counted instead of dropping the row.
+    columns = SHEET_COLUMNS[sheet_name]
+    df = pd.DataFrame(rows).reindex(columns=columns)
+    parse_failures = 0
+    for column, kind in SHEET_TYPES[sheet_name].items():
+        text = df[column].where(df[column].notna(), "").astype(str).str.replace(",", "", regex=False).str.strip()
+        if kind == "date":
+            parsed = pd.to_datetime(text.str.replace("-", "/", regex=False), format="%Y/%m/%d", errors="coerce")
+        else:
+            parsed = pd.to_numeric(text, errors="coerce")
+            if kind == "int": parsed = parsed.where(parsed % 1 == 0).astype("Int64")
+        parse_failures += int(((text != "") & parsed.isna()).sum())
+        df[column] = parsed
+    size = len(df)
+    df = df.drop_duplicates(subset=SHEET_KEYS[sheet_name], ignore_index=True)
+    return df, {"parse_failures": parse_failures, "duplicates": size - len(df)}
+
+def _write_frame(ws, df, columns):
+    # Append a dataframe below the sheet's content, writing the header into an empty sheet
+    header_present = any(ws.cell(row=1, column=col_idx).value for col_idx in range(1, len(columns) + 1))
+    if not header_present:
+        for col_idx, col_name in enumerate(columns, start=1):
+            ws.cell(row=1, column=col_idx, value=col_name)
+        start_row = 2
+    else: start_row = ws.max_row + 1
+
+    frame = df[columns].copy()
+    for column in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[column]): frame[column] = frame[column].dt.date # date cells, no time part
+    values = frame.astype(object).where(frame.notna(), None).to_numpy().tolist()
+    for offset, row in enumerate(values):
+        for col_idx, value in enumerate(row, start=1):
+            ws.cell(row=start_row + offset, column=col_idx, value=value)
+
 def save_excel(rows, output_path: str = None, sheet_name: str = None) -> str:
     # Save data to the specified sheet
-    if sheet_name == "DB":
-        columns = ["title", "date", "exc_amount", "exc_shares", "exc_price", "listing_date"]
-    elif sheet_name == "EX":
-        columns = ["title", "date", "prv_prc", "cur_prc"]
-
-    # Create a dataframe from the rows
-    df = pd.DataFrame(rows)
-    available = [c for c in columns if c in df.columns]
-    df = df[available]
+    columns = SHEET_COLUMNS[sheet_name]
+
+    # Create a typed dataframe from the rows
+    df, stats = typed_frame(rows, sheet_name)
+    tracer.count("parse_failures", stats["parse_failures"], keyword=sheet_name)
+    tracer.count("duplicates", stats["duplicates"], keyword=sheet_name)
     
     if not output_path: output_path = _default_output_path()
     output_dir = os.path.dirname(output_path) or "."
@@ -30,25 +82,74 @@ def save_excel(rows, output_path: str = None, sheet_name: str = None) -> str:
     wb = load_workbook(output_path)
     ws = wb[sheet_name]
 
-    # Write header
-    header_present = False
-    if ws.max_row >= 1:
-        for col_idx, col_name in enumerate(available, start=1):
-            if ws.cell(row=1, column=col_idx).value:
-                header_present = True
-                break
-    if not header_present:
-        for col_idx, col_name in enumerate(available, start=1):
-            ws.cell(row=1, column=col_idx, value=col_name)
+    # Write header and data
+    with tracer.span("save_excel", sheet=sheet_name, rows=len(df)):
+        _write_frame(ws, df, columns)
+        wb.save(output_path)
+    return os.path.abspath(output_path)
 
-    # Write data
-    start_row = ws.max_row + 1
-    for offset, (_, row) in enumerate(df.iterrows(), start=0):
-        for col_idx, col_name in enumerate(available, start=1):
-            ws.cell(row=start_row + offset, column=col_idx, value=row.get(col_name))
+class EXCEL_WRITER:
+    # Buffers DB/EX rows in memory and writes the workbook once on close(),
+    # or every checkpoint_every add() calls. The LIST sheet is never touched.
+    # With a RESULT_STORE every flush upserts the rows into it first; excel=False writes only the store.
+    def __init__(self, output_path: str = None, sheets = ("DB", "EX"), checkpoint_every: int = None, clear: bool = True,
+                 store = None, excel: bool = True):
+        self.output_path = output_path or _default_output_path()
+        self.store = store
+        self.excel = excel
+        self.buffers = {sheet: [] for sheet in sheets}
+        self.checkpoint_every = checkpoint_every
+        self.pending = 0
+        self.needs_clear = clear
+        self.stats = {"parse_failures": 0, "duplicates": 0}
 
-    wb.save(output_path)
-    return os.path.abspath(output_path)
+    def add(self, rows, sheet_name: str):
+        self.buffers[sheet_name].extend(rows)
+        self.pending += 1
+        if self.checkpoint_every and self.pending >= self.checkpoint_every: self.flush()
+
+    def flush(self) -> str:
+        frames = {}
+        for sheet_name, rows in self.buffers.items():
+            if not rows: continue
+            frames[sheet_name], stats = typed_frame(rows, sheet_name)
+            for key, value in stats.items():
+                self.stats[key] += value
+                tracer.count(key, value, keyword=sheet_name)
+            if self.store: self.store.upsert(None, sheet_name, frame=frames[sheet_name])
+        if self.excel:
+            output_dir = os.path.dirname(self.output_path) or "."
+            os.makedirs(output_dir, exist_ok=True)
+            with tracer.span("excel_load"):
+                wb = load_workbook(self.output_path)
+            with tracer.span("excel_write", rows=sum(len(df) for df in frames.values())):
+                for sheet_name in self.buffers:
+                    ws = wb[sheet_name]
+                    if self.needs_clear: ws.delete_rows(1, ws.max_row)
+                    if sheet_name in frames: _write_frame(ws, frames[sheet_name], SHEET_COLUMNS[sheet_name])
+            with tracer.span("excel_save"):
+                wb.save(self.output_path)
+            wb.close()
+        self.buffers = {sheet: [] for sheet in self.buffers}
+        self.pending = 0
+        self.needs_clear = False
+        return os.path.abspath(self.output_path)
+
+    def close(self) -> str:
+        return self.flush()
+
+FAILURE_COLUMNS = ["sheet", "keyword", "company", "attempts", "reason"]
+
+def save_failures(failures, path: str) -> str:
+    # Issues given up on in the last run as CSV (utf-8-sig so Excel shows Korean); no failures removes the file
+    if not failures:
+        if os.path.exists(path): os.remove(path)
+        return None
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FAILURE_COLUMNS)
+        for failure in failures: writer.writerow([failure.get(column) for column in FAILURE_COLUMNS])
+    return os.path.abspath(path)
 
 def read_list_titles(output_path: str = None) -> list:
     # Read target companies from the LIST sheet
@@ -65,6 +166,19 @@ def read_list_titles(output_path: str = None) -> list:
 	wb.close()
 	return values
 
+def read_list_amounts(output_path: str = None) -> dict:
+    # Issue amount (KRW) per title from the optional LIST column C; titles left blank or unparsable are skipped
+	if not output_path: output_path = _default_output_path()
+	wb = load_workbook(output_path, read_only=True, data_only=True)
+	ws = wb["LIST"]
+	amounts = {}
+	for row_idx in range(2, ws.max_row + 1):
+		title = str(ws.cell(row=row_idx, column=1).value).strip()
+		amount = pd.to_numeric(str(ws.cell(row=row_idx, column=3).value or "").replace(",", ""), errors="coerce")
+		if pd.notna(amount) and amount > 0: amounts[title] = float(amount)
+	wb.close()
+	return amounts
+
 def clear_excel(output_path: str = None, sheet_name: str = None) -> str:
     # Clear the specified sheet
 	if not output_path: output_path = _default_output_path()
@@ -0,0 +1,214 @@
+import sys
+import json
+import time
+import datetime
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Local stand-in for the two SEIBRO screens with only what the scraper touches: #bd_input2_image1,
+# the #visDiv/#iframeIsin popup with #isinList, the date inputs, #image2, #grid1_body_tbody with
+# 15-row paging and #gridPaging_next_btn. Every data request and page load is delayed by `latency` seconds. With pager_base
+# 0 or 1 the page also has a window.gridPaging component (getCount, getSelectedIndex counting from
+# that base); without it the scraper can only tell the last page by a short page or a timeout.
+
+SCREENS = {"BIP_CNTS03024V": "details", "BIP_CNTS03025V": "prc"}
+# Grid layout per screen: DOM column -> record field (the columns seibro_scraper.ROW_COLUMNS reads)
+GRIDS = {
+    "details": {"width": 11, "columns": {3: "XRC_START_DT", 4: "XRC_END_DT", 5: "XRC_DT", 6: "XRC_AMT", 8: "XRC_STKQTY",
+                                         9: "XRC_PRICE", 10: "LIST_DT"}, "date_columns": [3, 4, 5, 10]},
+    "prc": {"width": 7, "columns": {1: "ADJ_DT", 5: "BEFORE_XRC_PRICE", 6: "AFTER_XRC_PRICE"}, "date_columns": [1]},
+}
+
+MAIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>mock SEIBRO</title>
+<link rel="stylesheet" href="/static/site.css"></head><body>
+<img src="/static/banner1.png"><img src="/static/banner2.png"><img src="/static/logo.gif">
+<input id="bd_input2_input" readonly><button id="bd_input2_image1" onclick="openPopup()">search</button>
+<div id="visDiv" style="display:none"><iframe id="iframeIsin" src="/popup" width="600" height="300"></iframe></div>
+<input id="inputCalendar1_input"><input id="inputCalendar2_input">
+<button id="image2" onclick="search()">query</button>
+<table id="grid1"><tbody id="grid1_body_tbody"></tbody></table>
+<button id="gridPaging_next_btn" onclick="nextPage()">next</button>
+<script>
+var SCREEN = "%(screen)s", PAGE_ROWS = 15, LATENCY_MS = %(latency_ms)d, API = %(api)s, PAGER_BASE = %(pager_base)s;
+var selected = null, data = [], page = 0;
+function openPopup() { document.getElementById("visDiv").style.display = "block"; }
+function selectIsin(isin, name) {
+    selected = isin;
+    document.getElementById("bd_input2_input").value = name;
+    document.getElementById("visDiv").style.display = "none";
+}
+function search() {
+    var from = document.getElementById("inputCalendar1_input").value;
+    var to = document.getElementById("inputCalendar2_input").value;
+    var x = new XMLHttpRequest();
+    x.open("GET", "/grid?screen=" + SCREEN + "&isin=" + selected + "&from=" + from + "&to=" + to, true);
+    x.onload = function() { data = JSON.parse(x.responseText); page = 0; render(); };
+    x.send();
+}
+function render() {
+    var tbody = document.getElementById("grid1_body_tbody");
+    var html = "";
+    data.slice(page * PAGE_ROWS, (page + 1) * PAGE_ROWS).forEach(function(row) {
+        html += "<tr>" + row.map(function(v) { return "<td>" + v + "</td>"; }).join("") + "</tr>";
+    });
+    tbody.innerHTML = html;
+}
+function nextPage() {
+    if ((page + 1) * PAGE_ROWS >= data.length) return;
+    page++;
+    setTimeout(render, LATENCY_MS);
+}
+if (API) {
+    window.grid1 = {
+        getRowCount: function() { return data.length; },
+        getColumnCount: function() { return data.length ? data[0].length : 0; },
+        getCellDisplayData: function(r, c) { return data[r][c]; }
+    };
+}
+if (PAGER_BASE !== null) {
+    window.gridPaging = {
+        getCount: function() { return Math.max(1, Math.ceil(data.length / PAGE_ROWS)); },
+        getSelectedIndex: function() { return page + PAGER_BASE; }
+    };
+}
+</script></body></html>"""
+
+POPUP_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"></head><body>
+<input id="search_string"><button id="image2" onclick="find()">find</button>
+<div id="group74"><div id="group118"><div id="isinList"></div></div></div>
+<script>
+var list = [];
+function find() {
+    var x = new XMLHttpRequest();
+    x.open("GET", "/isin?q=" + encodeURIComponent(document.getElementById("search_string").value), true);
+    x.onload = function() {
+        list = JSON.parse(x.responseText);
+        var html = "";
+        list.forEach(function(item, i) {
+            html += '<div id="isinList_' + i + '_ISIN_ROW" onclick="pick(' + i + ')"><span>' + item.isin + '</span>'
+                  + '<div id="isinList_' + i + '_group178">' + item.name + '</div></div>';
+        });
+        document.getElementById("isinList").innerHTML = html;
+    };
+    x.send();
+}
+function pick(i) { parent.selectIsin(list[i].isin, list[i].name); }
+</script></body></html>"""
+
+# Assets the real pages pull in but the scraper never reads, to measure resource blocking offline
+STATIC = {
+    "site.css": ("text/css", b"@font-face { font-family: nanum; src: url(/static/nanum.woff2); } body { font-family: nanum; }"),
+    "nanum.woff2": ("font/woff2", b"\0" * 400000),
+    "banner1.png": ("image/png", b"\0" * 250000),
+    "banner2.png": ("image/png", b"\0" * 250000),
+    "logo.gif": ("image/gif", b"\0" * 50000),
+}
+
+def _fmt_num(n):
+    return f"{n:,}"
+
+def _day(base, offset):
+    return (datetime.datetime.strptime(base, "%Y%m%d") - datetime.timedelta(days=offset)).strftime("%Y%m%d")
+
+class MOCK_DATA:
+    # Deterministic issues: company "회사0001" with bond "회사0001 1CB", ISIN KR6000000001
+    def __init__(self, issues = 10, bonds_per_company = 1, details_rows = 40, prc_rows = 5, last_date = "20251001"):
+        self.issues = []
+        for k in range(1, issues + 1):
+            company = f"회사{(k - 1) // bonds_per_company + 1:04d}"
+            bond = f"{(k - 1) % bonds_per_company + 1}CB"
+            self.issues.append({"isin": f"KR6{k:09d}", "company": company, "name": f"{company} {bond}"})
+        self.details_rows = details_rows
+        self.prc_rows = prc_rows
+        self.last_date = last_date
+
+    def list_titles(self):
+        # LIST sheet rows: (keyword, company)
+        return [[issue["name"], issue["company"]] for issue in self.issues]
+
+    def search(self, query):
+        return [{"isin": i["isin"], "name": i["name"]} for i in self.issues if query and (query in i["company"] or query == i["isin"])]
+
+    def records(self, screen, isin, from_date = None, to_date = None):
+        # Raw records (YYYYMMDD dates, plain numbers), newest first
+        seed = int(isin[3:]) if isin and isin[3:].isdigit() else 0
+        records = []
+        if screen == "details":
+            for r in range(self.details_rows):
+                day = _day(self.last_date, r * 3 + seed % 3)
+                shares = 1000 + (seed * 37 + r * 11) % 5000
+                records.append({"XRC_START_DT": "20210101", "XRC_END_DT": "20261231", "XRC_DT": day,
+                                "XRC_AMT": str(shares * 10000), "XRC_STKQTY": str(shares), "XRC_PRICE": "10000",
+                                "LIST_DT": _day(day, -14)})
+        else:
+            for r in range(self.prc_rows):
+                day = _day(self.last_date, r * 90 + seed % 5)
+                records.append({"ADJ_DT": day, "BEFORE_XRC_PRICE": str(11000 - r * 200), "AFTER_XRC_PRICE": str(10800 - r * 200)})
+        date_field = "XRC_DT" if screen == "details" else "ADJ_DT"
+        return [rec for rec in records if (not from_date or rec[date_field] >= from_date) and (not to_date or rec[date_field] <= to_date)]
+
+    def grid(self, screen, isin, from_date = None, to_date = None):
+        # The same records as the DOM grid shows them
+        spec = GRIDS[screen]
+        grid = []
+        for n, rec in enumerate(self.records(screen, isin, from_date, to_date), start=1):
+            values = [""] * spec["width"]
+            values[0] = str(n)
+            for col, field in spec["columns"].items():
+                value = rec[field]
+                if col in spec["date_columns"]: value = f"{value[:4]}/{value[4:6]}/{value[6:]}"
+                elif value.isdigit(): value = _fmt_num(int(value))
+                values[col] = value
+            grid.append(values)
+        return grid
+
+def make_handler(data, latency = 0.0, api = False, pager_base = None):
+    class MockHandler(BaseHTTPRequestHandler):
+        def _send(self, payload, content_type):
+            if isinstance(payload, str): payload = payload.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if latency: time.sleep(latency)
+            if url.path == "/websquare/control.jsp":
+                screen = next((screen for key, screen in SCREENS.items() if key in query.get("w2xPath", "")), None)
+                if not screen: return self.send_error(404)
+                self._send(MAIN_PAGE % {"screen": screen, "latency_ms": int(latency * 1000), "api": "true" if api else "false",
+                                        "pager_base": "null" if pager_base is None else int(pager_base)}, "text/html; charset=utf-8")
+            elif url.path.startswith("/static/") and url.path[8:] in STATIC:
+                content_type, payload = STATIC[url.path[8:]]
+                self._send(payload, content_type)
+            elif url.path == "/popup":
+                self._send(POPUP_PAGE, "text/html; charset=utf-8")
+            elif url.path == "/isin":
+                self._send(json.dumps(data.search(query.get("q", "")), ensure_ascii=False), "application/json")
+            elif url.path == "/grid":
+                grid = data.grid(query.get("screen"), query.get("isin"), query.get("from"), query.get("to"))
+                self._send(json.dumps(grid, ensure_ascii=False), "application/json")
+            else: self.send_error(404)
+
+        def log_message(self, format, *args):
+            pass
+    return MockHandler
+
+def serve(data, host = "127.0.0.1", port = 0, latency = 0.0, api = False, pager_base = None):
+    # Starts the server on a daemon thread; returns (server, base_url)
+    server = ThreadingHTTPServer((host, port), make_handler(data, latency, api, pager_base))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+if __name__ == "__main__":
+    issues = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8766
+    server, base_url = serve(MOCK_DATA(issues), port=port)
+    print(f"Mock SEIBRO with {issues} issues on {base_url}/websquare/control.jsp?w2xPath=/BIP_CNTS03024V.xml")
+    threading.Event().wait()
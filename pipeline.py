@@ -0,0 +1,240 @@
+import os
+import time
+import importlib.util
+
+from trace_log import tracer
+
+# One full run - LIST -> details/prc scraping -> DB/EX - shared by the Tk GUI (main.py) and the
+# headless CLI (cli.py). Nothing here imports tkinter. Progress is reported through
+# emit(event, **fields) with the events "log", "status", "progress" and "result".
+
+def _beside(output_path, filename):
+    # Cache/index/trace files live next to the workbook
+    from export_results import _default_output_path
+    if not output_path: return _default_output_path(filename)
+    return os.path.join(os.path.dirname(os.path.abspath(output_path)), filename)
+
+def _check_recycling(emit):
+    # recycle_rss_mb needs psutil; without it only recycle_units restarts Chrome, so say so once per run
+    from seibro_scraper import get
+    if get("recycle_rss_mb") and importlib.util.find_spec("psutil") is None:
+        emit("log", message="psutil이 설치되어 있지 않아 메모리 기준 브라우저 재시작이 꺼져 있습니다. (처리 건수 기준만 적용)")
+
+def _analyse(store, output_path, titles, emit):
+    # ANALYSIS sheet (analytics.py) from the stored DB/EX rows of the LIST titles
+    from seibro_scraper import get
+    from analytics import save_analysis
+    from export_results import read_list_amounts
+    if not get("analysis_sheet"): return
+    try:
+        save_analysis(store.query("DB", titles=titles), store.query("EX", titles=titles), output_path, get("analysis_sheet"),
+                      issue_amounts=read_list_amounts(output_path))
+    except Exception as e: emit("log", message=f"분석 시트 저장 실패: {e}")
+
+def export_from_store(emit, output_path = None):
+    # DB/EX of results.xlsx regenerated from the result store for the titles in LIST, without scraping
+    from seibro_scraper import get
+    from export_results import read_list_titles
+    from result_store import RESULT_STORE
+    store = RESULT_STORE(path=_beside(output_path, get("result_store")))
+    try:
+        titles = [title for title, company in read_list_titles(output_path)]
+        path = store.export_excel(output_path, titles=titles)
+        _analyse(store, output_path, titles, emit)
+        emit("log", message=f"{len(titles)}개 종목을 결과 DB에서 엑셀로 내보냈습니다: {path}")
+        return path
+    finally: store.close()
+
+def run_pipeline(emit, is_running = None, output_path = None, workers = None, from_date = "20210101", to_date = None,
+                 paired = None, full_refresh = None, headless = True, resume = None):
+    # Returns {"status": "completed" | "stopped" | "empty", "units", "failed", "rows", "resumed", "failures",
+    # "parse_failures", "duplicates", "trace", "summary"}.
+    # Finished units are journaled as they arrive; with resume, a run of the same LIST and from_date that was
+    # stopped or crashed (even on an earlier day) skips them and rebuilds DB/EX from the journal.
+    if is_running is None: is_running = lambda: True
+    tracer.reset()
+    warm = None
+    discard_warm = None
+    journal = None
+    store = None
+    summary = {"status": "stopped", "units": 0, "failed": 0, "rows": 0, "resumed": 0}
+    try:
+        emit("log", message="세이브로 데이터 다운로드를 시작합니다.")
+        emit("status", status="준비 중...", color="blue")
+        with tracer.span("import"):
+            from seibro_scraper import get, run_scrape_pool, plan_windows, pool_workers, prewarm, discard_warm
+        if workers is None: workers = get("workers")
+        if paired is None: paired = get("paired_screens")
+        if full_refresh is None: full_refresh = get("full_refresh")
+        if resume is None: resume = get("resume")
+        base_config = {
+            "from_date": from_date,
+            "to_date": to_date or time.strftime("%Y%m%d"),
+            "headless": headless,
+            "display": False,
+        }
+
+        # Chrome starts in the background while the workbook is prepared
+        warm = prewarm(base_config, workers * (2 if paired else 1))
+        with tracer.span("import"):
+            from export_results import read_list_titles, EXCEL_WRITER, save_failures
+            from scrape_cache import SCRAPE_CACHE, ISIN_INDEX, RUN_JOURNAL
+            from result_store import RESULT_STORE
+
+        # Rows go to the result store; DB/EX are cleared on the writer's first save
+        emit("log", message="엑셀을 준비하는 중...")
+        store = RESULT_STORE(path=_beside(output_path, get("result_store")))
+        writer = EXCEL_WRITER(output_path=output_path, checkpoint_every=get("excel_checkpoint"), store=store, excel=get("excel_export"))
+
+        # Read company list
+        emit("log", message="회사 목록 읽는 중...")
+        excel = read_list_titles(output_path)
+        if not excel:
+            emit("log", message="엑셀 파일에 기업이 없습니다.")
+            emit("status", status="기업이 없습니다.", color="red")
+            summary["status"] = "empty"
+            return summary
+
+        emit("log", message=f"{len(excel)}개 기업을 발견했습니다.")
+
+        # Create scraper pool
+        urls = [get("details_url"), get("prc_url")]
+        sheets = {get("details_url"): "DB", get("prc_url"): "EX"}
+        labels = {get("details_url"): "행사내역", get("prc_url"): "전환가 변동내역"}
+        total_units = len(excel) * len(urls)
+        finished = {url: {} for url in urls}
+        failures = []
+        next_index = {url: 0 for url in urls}
+
+        def deliver(url, i, rows):
+            # Hand rows to the writer in LIST order as soon as the prefix is complete
+            finished[url][i] = rows
+            while next_index[url] in finished[url]:
+                rows_in_order = finished[url].pop(next_index[url])
+                if rows_in_order: writer.add(rows_in_order, sheets[url])
+                next_index[url] += 1
+            summary["units"] += 1
+            if rows is None: summary["failed"] += 1
+            else: summary["rows"] += len(rows)
+
+        def on_result(url, i, config, rows):
+            if rows is not None: journal.record(url, i, config["keyword"], rows)
+            if rows is None or config.get("failure"):
+                # A failed fetch with cached history still exports the history, but is reported
+                reason = config.get("failure", "unknown") + ("" if rows is None else " (cached rows kept)")
+                failures.append({"sheet": sheets[url], "keyword": config["keyword"], "company": config["company"],
+                                 "attempts": config.get("attempts"), "reason": reason})
+            deliver(url, i, rows)
+            done = summary["units"]
+            emit("progress", current=done, total=total_units)
+            emit("result", sheet=sheets[url], keyword=config["keyword"], rows=None if rows is None else len(rows))
+            if rows is None:
+                emit("log", message=f"{config['keyword']}의 {labels[url]} 수집 실패: {config.get('failure', 'unknown')} ({done}/{total_units})")
+            elif rows:
+                emit("log", message=f"{config['keyword']}의 {labels[url]} {len(rows)}개 데이터를 수집했습니다. ({done}/{total_units})")
+            else:
+                emit("log", message=f"{config['keyword']}의 {labels[url]} 해당하는 데이터가 없습니다. ({done}/{total_units})")
+
+        journal = RUN_JOURNAL(path=_beside(output_path, get("journal_file")))
+        # An interrupted run keeps the to_date it started with unless another end date is given explicitly
+        resumed = {unit: rows for unit, rows in journal.open(base_config, excel, resume=resume, to_date=to_date).items() if unit[0] in finished}
+        if journal.discarded:
+            emit("log", message=f"이전 실행 기록({journal.discarded}개 항목)이 기간 또는 목록이 달라 새로 시작합니다.")
+        if resumed:
+            for (url, i) in sorted(resumed, key=lambda unit: unit[1]):
+                if url in finished: deliver(url, i, resumed[(url, i)])
+            summary["resumed"] = len(resumed)
+            emit("log", message=f"중단된 실행에서 {len(resumed)}개 항목을 이어받았습니다. (종료일 {base_config['to_date']})")
+            emit("progress", current=summary["units"], total=total_units)
+
+        emit("status", status="데이터를 수집하는 중...", color="blue")
+        cache = SCRAPE_CACHE(path=_beside(output_path, "scrape_cache.json"), overlap_days=get("cache_overlap_days"), refresh=full_refresh,
+                             pending_days=get("cache_pending_days"))
+        index = ISIN_INDEX(path=_beside(output_path, "isin_index.json"))
+        plan = plan_windows(base_config, excel, urls, cache, resumed)
+        workers = pool_workers(excel, plan, workers)
+        browsers = workers * (len(urls) if paired else 1)
+        emit("log", message=f"Chrome 브라우저 {browsers}개로 데이터를 수집하는 중...\n")
+        _check_recycling(emit)
+        with tracer.span("pool"):
+            run_scrape_pool(base_config, excel, urls, workers=workers, is_running=is_running, on_result=on_result,
+                            cache=cache, index=index, paired=paired, warm=warm, plan=plan)
+        with tracer.span("export"):
+            cache.save()
+            index.save()
+            writer.close()
+            if get("excel_export"): _analyse(store, output_path, [title for title, company in excel], emit)
+            summary.update(writer.stats)
+            if writer.stats["parse_failures"] or writer.stats["duplicates"]:
+                emit("log", message=f"중복 {writer.stats['duplicates']}행 제거, 변환 실패 {writer.stats['parse_failures']}개 값")
+            summary["failures"] = save_failures(failures, _beside(output_path, get("failures_file")))
+            if failures: emit("log", message=f"{len(failures)}개 항목 수집 실패, 목록: {summary['failures']}")
+
+        if not is_running():
+            return summary
+        # The pool ran to the end: failed units are in failures.csv, so only a stopped or crashed run resumes
+        journal.close(finished=True)
+
+        emit("log", message="Chrome 브라우저가 정상적으로 종료되었습니다.")
+        emit("progress", current=total_units, total=total_units)
+        emit("status", status="Completed!", color="green")
+        emit("log", message="모든 데이터가 저장되었습니다.")
+        emit("log", message="데이터 수집이 완료되었습니다.")
+        summary["status"] = "completed"
+        return summary
+    finally:
+        if warm is not None: discard_warm(warm)
+        if journal is not None: journal.close()
+        if store is not None: store.close()
+        try:
+            from seibro_scraper import get
+            summary["trace"] = tracer.write(_beside(output_path, get("trace_file")))
+            summary["summary"] = tracer.summary_lines()
+        except Exception as e:
+            emit("log", message=f"트레이스 저장 실패: {e}")
+
+def run_schedule(emit, is_running = None, output_path = None, workers = None, from_date = "20210101",
+                 requests_per_minute = None, headless = True):
+    # Continuous mode (scheduler.py): refreshes LIST issues by staleness until is_running() turns false,
+    # keeping the result store current and re-exporting DB/EX every few minutes. The trace file holds the
+    # last export interval only, so memory stays flat however long it runs.
+    if is_running is None: is_running = lambda: True
+    tracer.reset()
+    from seibro_scraper import get
+    from export_results import read_list_titles
+    from scrape_cache import SCRAPE_CACHE, ISIN_INDEX
+    from result_store import RESULT_STORE
+    from scheduler import SCHEDULER
+    if workers is None: workers = get("workers")
+    excel = read_list_titles(output_path)
+    if not excel:
+        emit("log", message="엑셀 파일에 기업이 없습니다.")
+        return {"status": "empty", "fetches": 0}
+    urls = [get("details_url"), get("prc_url")]
+    sheets = {get("details_url"): "DB", get("prc_url"): "EX"}
+    base_config = {"from_date": from_date, "headless": headless, "display": False}
+    cache = SCRAPE_CACHE(path=_beside(output_path, "scrape_cache.json"), overlap_days=get("cache_overlap_days"),
+                         pending_days=get("cache_pending_days"))
+    index = ISIN_INDEX(path=_beside(output_path, "isin_index.json"))
+    store = RESULT_STORE(path=_beside(output_path, get("result_store")))
+    scheduler = SCHEDULER(base_config, excel, urls, cache, store, index=index, sheets=sheets,
+                          emit=emit, requests_per_minute=requests_per_minute)
+
+    def export():
+        cache.save()
+        index.save()
+        try: tracer.write(_beside(output_path, get("trace_file")), reset=True)
+        except Exception as e: emit("log", message=f"트레이스 저장 실패: {e}")
+        if not get("excel_export"): return
+        try:
+            store.export_excel(output_path, titles=[title for title, company in excel])
+            _analyse(store, output_path, [title for title, company in excel], emit)
+        except Exception as e: emit("log", message=f"엑셀 내보내기 실패 (다음에 다시 시도): {e}")
+
+    emit("log", message=f"{len(excel)}개 기업을 연속 갱신합니다.")
+    _check_recycling(emit)
+    emit("status", status="연속 갱신 중...", color="blue")
+    try: scheduler.run(is_running, workers=workers, on_export=export)
+    finally: store.close()
+    emit("status", status="Stopped", color="orange")
+    return {"status": "stopped", "fetches": scheduler.fetches}
@@ -0,0 +1,105 @@
+import os
+import json
+import sqlite3
+import datetime
+import threading
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from export_results import SHEET_COLUMNS, SHEET_TYPES, typed_frame, _write_frame, _default_output_path
+from trace_log import tracer
+
+# System of record for scraped rows: one SQLite table per sheet with typed columns, upserted on the
+# sheet's key columns so reruns update rows instead of appending them, and history from earlier runs
+# (and issues no longer in LIST) is kept. results.xlsx DB/EX are an export of it.
+#   store.query("DB", title="에스티팜 2CB", since="2024-09-01")
+
+TABLES = {"DB": "exercises", "EX": "price_resets"}
+# Upsert keys: only columns every record has. listing_date or a price can still be empty when a row is first
+# seen, and SQLite's UNIQUE treats NULLs as distinct, so keying on them would insert the row again each run
+# instead of filling it in. Rows with an empty key column (parse failures) are not stored.
+STORE_KEYS = {"DB": ["title", "date", "exc_shares"], "EX": ["title", "date"]}
+SQL_TYPES = {"date": "TEXT", "int": "INTEGER", "float": "REAL"} # dates as ISO "YYYY-MM-DD"
+
+def _sql_value(value):
+    # pandas scalar -> sqlite3 parameter
+    if value is None or pd.isna(value): return None
+    if isinstance(value, (pd.Timestamp, datetime.date)): return value.strftime("%Y-%m-%d")
+    if hasattr(value, "item"): return value.item() # numpy / pandas integer and float scalars
+    return value
+
+class RESULT_STORE:
+    def __init__(self, path: str = None):
+        self.path = path or _default_output_path("results.sqlite")
+        self.lock = threading.Lock()
+        # Flushes come from the scraping threads; the lock serialises them on one connection
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        for sheet_name, table in TABLES.items():
+            types = SHEET_TYPES[sheet_name]
+            columns = ", ".join(f"{column} {SQL_TYPES.get(types.get(column), 'TEXT')}" for column in SHEET_COLUMNS[sheet_name])
+            keys = ", ".join(STORE_KEYS[sheet_name])
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns}, first_seen TEXT, last_seen TEXT)")
+            self.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_key ON {table} ({keys})")
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_title_date ON {table} (title, date)")
+        self.conn.commit()
+
+    def upsert(self, rows, sheet_name: str, frame = None) -> int:
+        # Raw rows (or an already typed frame) -> insert new records, fill in / refresh the others;
+        # returns the number of rows written
+        df = frame if frame is not None else typed_frame(rows, sheet_name)[0]
+        keys = STORE_KEYS[sheet_name]
+        df = df.dropna(subset=keys)
+        if df.empty: return 0
+        table = TABLES[sheet_name]
+        columns = SHEET_COLUMNS[sheet_name]
+        # A value seen before is not erased by a later fetch that shows the cell empty
+        updates = ", ".join(f"{column} = COALESCE(excluded.{column}, {column})" for column in columns if column not in keys)
+        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        values = [[_sql_value(value) for value in row] + [now, now] for row in df[columns].astype(object).itertuples(index=False)]
+        sql = (f"INSERT INTO {table} ({', '.join(columns)}, first_seen, last_seen) VALUES ({', '.join('?' * (len(columns) + 2))}) "
+               f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates + ', ' if updates else ''}last_seen = excluded.last_seen")
+        with self.lock, tracer.span("store_upsert", sheet=sheet_name, rows=len(values)):
+            with self.conn: self.conn.executemany(sql, values)
+        return len(values)
+
+    def query(self, sheet_name: str, title: str = None, since: str = None, until: str = None, titles = None):
+        # Typed frame of a sheet's records, newest first per title; since/until are "YYYY-MM-DD" (inclusive)
+        conditions, params = [], []
+        if title is not None: conditions.append("title = ?"); params.append(title)
+        if titles is not None:
+            conditions.append("title IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(titles), ensure_ascii=False))
+        if since: conditions.append("date >= ?"); params.append(since)
+        if until: conditions.append("date <= ?"); params.append(until)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        columns = SHEET_COLUMNS[sheet_name]
+        with self.lock:
+            df = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM {TABLES[sheet_name]}{where} ORDER BY title, date DESC", self.conn, params=params)
+        for column, kind in SHEET_TYPES[sheet_name].items():
+            if kind == "date": df[column] = pd.to_datetime(df[column], format="%Y-%m-%d", errors="coerce")
+            elif kind == "int": df[column] = df[column].astype("Int64")
+            else: df[column] = df[column].astype("float64")
+        return df
+
+    def export_excel(self, output_path: str = None, titles = None, sheets = ("DB", "EX")) -> str:
+        # Rewrite the DB/EX sheets from the store (only the given LIST titles, if any); LIST is not touched
+        output_path = output_path or _default_output_path()
+        wb = load_workbook(output_path)
+        with tracer.span("store_export", titles=None if titles is None else len(titles)):
+            for sheet_name in sheets:
+                df = self.query(sheet_name, titles=titles)
+                if titles is not None:
+                    # LIST order, as a scraping run writes them
+                    order = {title: n for n, title in enumerate(dict.fromkeys(titles))}
+                    df = df.iloc[df["title"].map(order).argsort(kind="stable")]
+                ws = wb[sheet_name]
+                ws.delete_rows(1, ws.max_row)
+                _write_frame(ws, df, SHEET_COLUMNS[sheet_name])
+            wb.save(output_path)
+        wb.close()
+        return os.path.abspath(output_path)
+
+    def close(self):
+        with self.lock: self.conn.close()
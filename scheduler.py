@@ -0,0 +1,145 @@
+import time
+import heapq
+import datetime
+import threading
+
+from seibro_scraper import get, SCRAPE_LANE
+from trace_log import tracer
+
+# Continuous mode: instead of one pass over LIST, every (screen, issue) job is refreshed again and again,
+# most overdue first. How soon a job is due again depends on how live the issue is:
+#   hot  - in its exercise period and it changed on the last refresh or was exercised recently
+#   warm - anything else not known to be over (never fetched, no rows yet, quiet)
+#   cold - exercise period over (matured / fully converted)
+# Fetches are spaced to stay under requests_per_minute across all workers; the result store, cache and
+# index are updated after each fetch and results.xlsx is re-exported from the store every export_minutes.
+SCHEDCONST = {
+    "requests_per_minute": 20,
+    "hot_minutes": 15,
+    "warm_minutes": 180,
+    "cold_minutes": 7 * 24 * 60,
+    "retry_minutes": 30, # after a failed fetch
+    "active_days": 90, # an exercise within this many days keeps an issue in its period hot
+    "export_minutes": 10,
+    "poll_time": 0.5, # sleep granularity, so Stop is noticed quickly
+}
+
+def _day(value):
+    # "YYYY/MM/DD" (or YYYYMMDD) -> "YYYYMMDD", "" when missing
+    return str(value or "").replace("/", "").replace("-", "")
+
+class SCHEDULER:
+    # Priority queue of (due time, sequence, (url, i)) over the LIST items and screens
+    def __init__(self, base_config, items, urls, cache, store, index = None, sheets = None,
+                 emit = None, requests_per_minute = None):
+        self.base_config = base_config
+        self.items = items
+        self.urls = urls
+        self.cache = cache
+        self.store = store
+        self.index = index
+        self.sheets = sheets or {}
+        self.emit = emit or (lambda event, **fields: None)
+        self.spacing = 60.0 / (requests_per_minute or SCHEDCONST["requests_per_minute"])
+        self.lock = threading.Condition()
+        self.heap = []
+        self.sequence = 0
+        self.changed = {} # (url, i) -> the last refresh found new rows
+        self.next_slot = 0.0
+        self.fetches = 0
+        siblings = {}
+        for item in items: siblings.setdefault(item[1], []).append(item[0])
+        self.siblings = siblings
+        now = time.time()
+        for url in urls:
+            for i, item in enumerate(items):
+                fetched_at = cache.fetched_at(url, item[0])
+                self._push((url, i), fetched_at + self._interval(url, i) if fetched_at else now)
+
+    def _push(self, job, due):
+        with self.lock:
+            heapq.heappush(self.heap, (due, self.sequence, job))
+            self.sequence += 1
+            self.lock.notify()
+
+    def tier(self, url, i):
+        # "hot" | "warm" | "cold" from the issue's cached exercise rows (the details screen decides for both)
+        keyword = self.items[i][0]
+        rows = self.cache.history(get("details_url"), keyword) or []
+        today = datetime.date.today().strftime("%Y%m%d")
+        period_end = max((_day(row.get("exc_end")) for row in rows), default="")
+        if period_end and period_end < today: return "cold"
+        if not period_end: return "warm"
+        recent = (datetime.date.today() - datetime.timedelta(days=SCHEDCONST["active_days"])).strftime("%Y%m%d")
+        last_exercise = max((_day(row.get("date")) for row in rows), default="")
+        changed = any(self.changed.get((screen, i)) for screen in self.urls)
+        return "hot" if changed or last_exercise >= recent else "warm"
+
+    def _interval(self, url, i):
+        return SCHEDCONST[f"{self.tier(url, i)}_minutes"] * 60
+
+    def _wait(self, is_running, until):
+        while is_running() and time.time() < until:
+            time.sleep(min(SCHEDCONST["poll_time"], max(0.0, until - time.time())))
+        return is_running()
+
+    def _next_job(self, is_running):
+        # Pop the most overdue job once it is due and a request slot is free; None when stopped
+        with self.lock:
+            while is_running():
+                if self.heap and self.heap[0][0] <= time.time():
+                    due, _, job = heapq.heappop(self.heap)
+                    slot = max(time.time(), self.next_slot)
+                    self.next_slot = slot + self.spacing
+                    break
+                self.lock.wait(SCHEDCONST["poll_time"])
+            else: return None
+        # Budget: requests are spaced evenly, whichever worker sends them
+        return job if self._wait(is_running, slot) else None
+
+    def refresh(self, lane, job):
+        # One incremental fetch: cache window -> lane -> cache merge + store upsert; reschedules the job
+        url, i = job
+        item = self.items[i]
+        config = self.base_config.copy()
+        config.update(keyword=item[0], company=item[1], siblings=self.siblings[item[1]])
+        config["to_date"] = time.strftime("%Y%m%d")
+        config["from_date"] = self.cache.start_date(url, item[0], self.base_config["from_date"])
+        before = {tuple(row.items()) for row in self.cache.history(url, item[0]) or []}
+        with tracer.span("scheduled_refresh", keyword=item[0], url=url):
+            rows = lane.scrape(url, config)
+        self.fetches += 1
+        if rows is None:
+            self.emit("log", message=f"{item[0]} 갱신 실패: {config.get('failure', 'unknown')}")
+            self._push(job, time.time() + SCHEDCONST["retry_minutes"] * 60)
+            return
+        history = self.cache.merge(url, item[0], rows, config["from_date"], config["to_date"])
+        new_rows = [row for row in history if tuple(row.items()) not in before]
+        self.changed[job] = bool(new_rows)
+        if rows and self.store: self.store.upsert(rows, self.sheets.get(url))
+        tier = self.tier(url, i)
+        self.emit("result", sheet=self.sheets.get(url), keyword=item[0], rows=len(history), new=len(new_rows), tier=tier)
+        if new_rows:
+            self.emit("log", message=f"{item[0]}의 {self.sheets.get(url)} 새 데이터 {len(new_rows)}개 ({tier})")
+        self._push(job, time.time() + SCHEDCONST[f"{tier}_minutes"] * 60)
+
+    def run(self, is_running, workers = 1, on_export = None):
+        # Blocks until is_running() turns false; on_export() runs every export_minutes and at the end
+        def worker():
+            lane = SCRAPE_LANE(self.base_config, self.cache, self.index)
+            try:
+                while True:
+                    job = self._next_job(is_running)
+                    if job is None: return
+                    try: self.refresh(lane, job)
+                    except Exception as e:
+                        self.emit("log", message=f"{self.items[job[1]][0]} 갱신 오류: {e}")
+                        self._push(job, time.time() + SCHEDCONST["retry_minutes"] * 60)
+            finally: lane.cleanup()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, workers))]
+        for thread in threads: thread.start()
+        while self._wait(is_running, time.time() + SCHEDCONST["export_minutes"] * 60):
+            if on_export: on_export()
+        for thread in threads: thread.join()
+        if on_export: on_export()
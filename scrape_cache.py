@@ -0,0 +1,190 @@
+import os
+import re
+import json
+import time
+import datetime
+import threading
+
+from export_results import _default_output_path
+
+def _row_day(row):
+    # "YYYY/MM/DD" -> "YYYYMMDD", the format _fill_dates types
+    return str(row.get("date") or "").replace("/", "").replace("-", "")
+
+# Fields SEIBRO can show empty at first and fill in later (a DB row is posted before its listing date is known)
+PENDING_FIELDS = ("listing_date", "exc_price", "cur_prc")
+
+class SCRAPE_CACHE:
+    # Per-issue history keyed by (screen url, keyword) with the last date already fetched.
+    # A run only asks for [watermark - overlap_days, to_date] and merges it into the cached rows; it starts
+    # earlier when a cached row within pending_days of the watermark still has a PENDING_FIELDS value missing.
+    def __init__(self, path: str = None, overlap_days: int = 7, refresh: bool = False, pending_days: int = 60):
+        self.path = path or _default_output_path("scrape_cache.json")
+        self.overlap_days = overlap_days
+        self.pending_days = pending_days
+        self.refresh = refresh
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def _key(self, url, keyword):
+        return f"{url}|{keyword}"
+
+    def start_date(self, url, keyword, from_date):
+        # First day that still has to be fetched for this issue
+        with self.lock:
+            entry = self.entries.get(self._key(url, keyword))
+        if self.refresh or not entry: return from_date
+        watermark = datetime.datetime.strptime(entry["watermark"], "%Y%m%d")
+        start = (watermark - datetime.timedelta(days=self.overlap_days)).strftime("%Y%m%d")
+        # Rows still waiting for a value are fetched again until it appears (rows given up on are not)
+        oldest = (watermark - datetime.timedelta(days=self.pending_days)).strftime("%Y%m%d")
+        pending = [_row_day(row) for row in entry["rows"] if any(field in row and not row[field] for field in PENDING_FIELDS)]
+        start = min([start] + [day for day in pending if day >= oldest])
+        return max(from_date, start)
+
+    def history(self, url, keyword):
+        # Cached rows, or None for an issue never fetched
+        with self.lock:
+            entry = self.entries.get(self._key(url, keyword))
+            return list(entry["rows"]) if entry else None
+
+    def row_count(self, url, keyword):
+        # Rows cached for an issue, 0 when never fetched
+        with self.lock:
+            entry = self.entries.get(self._key(url, keyword))
+            return len(entry["rows"]) if entry else 0
+
+    def merge(self, url, keyword, rows, from_date, to_date):
+        # Rows fetched for [from_date, to_date] replace the cached rows of that window
+        with self.lock:
+            key = self._key(url, keyword)
+            entry = self.entries.get(key)
+            history = [] if (self.refresh or not entry) else [row for row in entry["rows"] if not (from_date <= _row_day(row) <= to_date)]
+            history.extend(rows)
+            history.sort(key=_row_day, reverse=True)
+            self.entries[key] = {"watermark": to_date, "fetched_at": time.time(), "rows": history}
+            return list(history)
+
+    def fetched_at(self, url, keyword):
+        # time.time() of the last successful fetch, or None (never fetched, or cached before this was recorded)
+        with self.lock:
+            entry = self.entries.get(self._key(url, keyword))
+            return entry.get("fetched_at") if entry else None
+
+    def save(self):
+        with self.lock:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+class ISIN_INDEX:
+    # LIST (keyword, company) -> ISIN and #isinList position, so an issue is found without matching names again
+    ISIN_PATTERN = re.compile(r"KR[0-9A-Z]{10}")
+
+    def __init__(self, path: str = None):
+        self.path = path or _default_output_path("isin_index.json")
+        self.lock = threading.Condition()
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def _key(self, config):
+        return f"{config.get('keyword')}|{config.get('company')}"
+
+    def get(self, config):
+        with self.lock:
+            return self.entries.get(self._key(config))
+
+    def put(self, config, isin_text, position, text):
+        # isin_text is the ISIN itself or the popup row text containing it; entries without one
+        # can still be picked again from a list left open in the popup
+        match = self.ISIN_PATTERN.search(isin_text or "")
+        with self.lock:
+            self.entries[self._key(config)] = {"isin": match.group(0) if match else None, "position": position, "text": text}
+            self.lock.notify_all()
+
+    def wait_for(self, config, timeout):
+        # Entry for config once another thread has put it, or None after timeout
+        key = self._key(config)
+        with self.lock:
+            self.lock.wait_for(lambda: key in self.entries, timeout)
+            return self.entries.get(key)
+
+    def drop(self, config):
+        with self.lock:
+            self.entries.pop(self._key(config), None)
+
+    def save(self):
+        with self.lock:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+class RUN_JOURNAL:
+    # Append-only JSON lines of finished (screen url, LIST position) units with their rows, fsynced per unit.
+    # The first line identifies the run (from_date and LIST) and stores the to_date it was started with, so a
+    # run interrupted before midnight still resumes the next day with its original dates; any other run starts
+    # a new journal. A line cut off by a crash is ignored.
+    def __init__(self, path: str = None):
+        self.path = path or _default_output_path("run_journal.jsonl")
+        self.lock = threading.Lock()
+        self.file = None
+        self.discarded = 0 # finished units of a previous journal that did not match this run
+
+    def _header(self, config, items):
+        return {"from_date": config["from_date"], "to_date": config["to_date"], "items": [list(item) for item in items]}
+
+    def _same_run(self, stored, header, to_date):
+        # to_date: the end date asked for explicitly, or None to take the interrupted run's
+        if not isinstance(stored, dict) or "to_date" not in stored: return False
+        if (stored.get("from_date"), stored.get("items")) != (header["from_date"], header["items"]): return False
+        return to_date is None or stored["to_date"] == to_date
+
+    def open(self, config, items, resume: bool = True, to_date: str = None) -> dict:
+        # Returns {(url, i): rows} already finished by an interrupted run of the same LIST; when it resumes one,
+        # config["to_date"] is set back to the date that run started with
+        header = self._header(config, items)
+        finished = {}
+        self.discarded = 0
+        if resume and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+            try: stored = json.loads(lines[0])
+            except ValueError: stored = None
+            resumable = self._same_run(stored, header, to_date)
+            for line in lines[1:]:
+                try: unit = json.loads(line)
+                except ValueError: continue
+                if not resumable: self.discarded += 1
+                elif 0 <= unit["i"] < len(items) and unit["keyword"] == items[unit["i"]][0]:
+                    finished[(unit["url"], unit["i"])] = unit["rows"]
+            if resumable: config["to_date"] = header["to_date"] = stored["to_date"]
+        # Rewritten without a torn tail so new units start on a line of their own
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for (url, i), rows in finished.items():
+                f.write(json.dumps({"url": url, "i": i, "keyword": items[i][0], "rows": rows}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+        return finished
+
+    def record(self, url, i, keyword, rows):
+        line = json.dumps({"url": url, "i": i, "keyword": keyword, "rows": rows}, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self, finished: bool = False):
+        # finished: the run went through every unit and the export is saved, so there is nothing left to resume
+        with self.lock:
+            if self.file: self.file.close()
+            self.file = None
+            if finished and os.path.exists(self.path): os.remove(self.path)
@@ -0,0 +1,877 @@
+import os
+import json
+import time
+import shutil
+import threading
+import queue
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.remote.command import Command
+
+# Browser-specific services and options
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from trace_log import tracer
+
+SYSCONST = {
+    "details_url": "https://seibro.or.kr/websquare/control.jsp?w2xPath=/IPORTAL/user/bond/BIP_CNTS03024V.xml&menuNo=416",
+    "prc_url": "https://seibro.or.kr/websquare/control.jsp?w2xPath=/IPORTAL/user/bond/BIP_CNTS03025V.xml&menuNo=417",
+    "search_button_selector": "#bd_input2_image1",
+    "company_input_selector": "#search_string",
+    "company_search_selector": "#image2",
+    "popup_selector": "#visDiv",
+    "popup_iframe": "#iframeIsin",
+    "from_date_selector": "#inputCalendar1_input",
+    "to_date_selector": "#inputCalendar2_input",
+    "buffer_time": 0.4,
+    "long_loadtime": 5,
+    "short_loadtime": 1.5,
+    "poll_time": 0.1,
+    "empty_grid_settle_ms": 300, # grid request done this long ago and no rows drawn: an empty result
+    "grid_id": "grid1",
+    "paging_id": "gridPaging",
+    "page_rows": 15,
+    "workers": 3,
+    "full_refresh": False, # ignore scrape_cache.json watermarks and fetch from from_date again
+    "cache_overlap_days": 7, # re-fetch this many days before each watermark to catch late postings
+    "cache_pending_days": 60, # and from the oldest row of the last this-many days still missing its listing date or price
+    "paired_screens": False, # scrape details_url and prc_url of an issue at the same time, one driver each
+    "trace_file": "trace.json", # per-run Chrome trace next to results.xlsx (".jsonl" for JSON lines)
+    "block_resources": True, # drop blocked_urls at the network layer (CDP Network.setBlockedURLs)
+    # Neither screen reads images, fonts, media or trackers; WebSquare's scripts, XML and CSS
+    # (grid visibility depends on it) must stay
+    "blocked_urls": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.bmp", "*.ico", "*.svg", "*.webp",
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+        "*.mp4", "*.webm", "*.mp3", "*.swf",
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*", "*wcs.naver.net*",
+    ],
+    "driver_cache": "chromedriver_path.json", # resolved chromedriver path, next to results.xlsx
+    "excel_checkpoint": 50, # results.xlsx is saved after every N company results, and at the end
+    "journal_file": "run_journal.jsonl", # finished units of the current run, next to results.xlsx
+    "resume": True, # an interrupted run of the same LIST and dates continues from journal_file
+    "retries": 2, # extra attempts for an issue that failed for a transient reason
+    "retry_backoff": 1.0, # seconds before the first retry, doubled for each further one
+    "unit_deadline": 90, # no new attempt for an issue starts after this many seconds
+    "failures_file": "failures.csv", # issues given up on, with the stage and reason, next to results.xlsx
+    # An issue whose cached history exceeds window_min_pages grid pages (a long serial paging chain) has a
+    # fetch range longer than window_days split into windows of that many days, fetched in parallel (0: never)
+    "window_days": 365,
+    "window_min_pages": 4,
+    "result_store": "results.sqlite", # every run's DB/EX rows, upserted; next to results.xlsx
+    "excel_export": True, # also write DB/EX into results.xlsx during the run (else: cli.py --export)
+    "analysis_sheet": "ANALYSIS", # exercises matched to the conversion price in force, cumulative and remaining amounts (None: off)
+    # A lane restarts its Chrome between companies once it has scraped recycle_units issues or its
+    # processes use recycle_rss_mb (measured only when psutil is installed); 0 disables either check
+    "recycle_units": 150,
+    "recycle_rss_mb": 1200,
+}
+def get(variable):
+    return SYSCONST[variable]
+
+class ISSUE_NOT_FOUND(Exception):
+    # The popup lists the company's bonds but not this one (LIST typo, delisted issue): retrying will not help
+    pass
+
+class SCRAPER:
+    def __init__(self, config, headless = False, process_type = None, display = False):
+        # Config contains from_date, to_date, company, key
+        self.config = config 
+        self.headless = headless
+        self.driver = None
+        self.wait = None
+        self.display = display
+        self.filled_dates = None # (from_date, to_date) currently typed into the page
+        self.commands = 0 # WebDriver commands sent
+        self.scripts = 0 # of which execute_script calls
+        self.pages = 0 # grid pages read
+        self.pager_base = None # getSelectedIndex() on the first page of the current result (0 or 1)
+        self.units = 0 # issues scraped by this browser
+
+    def setup(self): 
+        self.driver, self.wait = self.setup_driver(headless=self.headless)
+        # Every WebDriver command (WebElement calls included) goes through driver.execute
+        execute = self.driver.execute
+        def counted_execute(driver_command, params=None):
+            self.commands += 1
+            if driver_command in (Command.W3C_EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC): self.scripts += 1
+            return execute(driver_command, params)
+        self.driver.execute = counted_execute
+
+    def cleanup(self): 
+        if self.driver:
+            try: self.driver.quit()
+            except WebDriverException: pass # the session is already gone
+
+    def memory_mb(self):
+        # RSS of chromedriver and every Chrome process under it, or None without psutil
+        try: import psutil
+        except ImportError: return None
+        try:
+            process = psutil.Process(self.driver.service.process.pid)
+            return sum(p.memory_info().rss for p in [process] + process.children(recursive=True)) / (1024 * 1024)
+        except (psutil.Error, AttributeError): return None
+
+    def alive(self):
+        # False once Chrome crashed or the session was lost
+        try:
+            self.driver.execute_script("return 1;")
+            return True
+        except WebDriverException: return False
+    
+    def _wait_until(self, condition, timeout = None):
+        # Block until condition(driver) is truthy; raises TimeoutException at the deadline
+        return WebDriverWait(self.driver, timeout or get("long_loadtime"), poll_frequency=get("poll_time")).until(condition)
+
+    def _switch_to_popup(self):
+        # Waits for the popup iframe to be attached and loaded before switching into it
+        iframe_selector = get("popup_iframe")
+        self._wait_until(EC.frame_to_be_available_and_switch_to_it((By.CSS_SELECTOR, iframe_selector)))
+        if self.display:
+            print(f"Switched to iframe: {iframe_selector}")
+
+    def _wait_page_ready(self):
+        self._wait_until(lambda driver: driver.execute_script("return document.readyState") == "complete")
+        self._wait_until(EC.element_to_be_clickable((By.CSS_SELECTOR, get("search_button_selector"))))
+
+    def _wait_popup_list(self, match, timeout = None):
+        # Inside the popup iframe: wait until #isinList holds entries for which match(text, row_text) is true,
+        # return them as [(position, text, row_text)]
+        def matches(driver):
+            items = driver.execute_script(
+                """
+                var container = document.querySelector(arguments[0]);
+                if (!container) return null;
+                var items = container.querySelectorAll('[id^="isinList_"][id$="_group178"]');
+                var result = [];
+                for (var i = 0; i < items.length; i++) {
+                    var row = document.getElementById("isinList_" + i + "_ISIN_ROW");
+                    result.push([items[i].textContent.trim(), row ? row.textContent.trim() : ""]);
+                }
+                return result;
+                """,
+                "#group74 #group118 #isinList"
+            ) or []
+            found = [(i, text, row_text) for i, (text, row_text) in enumerate(items) if match(text, row_text)]
+            return found or False
+        return self._wait_until(matches, timeout)
+
+    def _search_popup(self, query, match, timeout = None):
+        # Open the ISIN popup if needed, search for query and return the matching entries (None on timeout).
+        # query=None only reopens the popup and checks the list a previous search left behind.
+        if not self.driver.execute_script("var p = document.querySelector(arguments[0]); return !!(p && p.getClientRects().length);", get("popup_selector")):
+            self._click_button(get("search_button_selector"))
+        if query is not None:
+            self._fill_input(get("company_input_selector"), query, in_iframe=True)
+            self._click_button(get("company_search_selector"), in_iframe=True)
+        self._switch_to_popup()
+        try: return self._wait_popup_list(match, timeout)
+        except TimeoutException: return None
+        finally: self.driver.switch_to.default_content()
+
+    def _wait_popup_closed(self):
+        try: self._wait_until(EC.invisibility_of_element_located((By.CSS_SELECTOR, get("popup_selector"))))
+        except TimeoutException: pass
+
+    def _mark_grid(self):
+        # Arm a MutationObserver on the grid so _wait_grid_changed sees redraws and body replacement, and
+        # count the page's XHRs: an empty result drawn into an already empty grid mutates nothing
+        self.driver.execute_script(
+            """
+            var body = document.querySelector(arguments[0]);
+            var target = body ? body.parentNode : document.body;
+            if (window.__gridObserver) window.__gridObserver.disconnect();
+            window.__gridChanged = false;
+            window.__gridObserver = new MutationObserver(function() { window.__gridChanged = true; });
+            window.__gridObserver.observe(target, {childList: true, subtree: true, characterData: true});
+            if (!window.__xhrCount) {
+                window.__xhrCount = {sent: 0, pending: 0, doneAt: 0};
+                var send = XMLHttpRequest.prototype.send;
+                XMLHttpRequest.prototype.send = function() {
+                    var count = window.__xhrCount;
+                    count.sent++; count.pending++;
+                    this.addEventListener("loadend", function() { count.pending--; count.doneAt = Date.now(); });
+                    return send.apply(this, arguments);
+                };
+            }
+            window.__xhrMark = window.__xhrCount.sent;
+            """,
+            "#grid1_body_tbody"
+        )
+
+    def _wait_grid_changed(self, timeout = None):
+        # True once the grid was redrawn after _mark_grid, or its request finished and left it empty (no rows
+        # to draw); False if neither happened before the deadline
+        condition = """
+            if (window.__gridChanged === true) return true;
+            var count = window.__xhrCount, body = document.querySelector(arguments[0]);
+            if (!count || count.sent <= window.__xhrMark || count.pending > 0 || Date.now() - count.doneAt < arguments[1]) return false;
+            return !body || body.getElementsByTagName("tr").length === 0;
+            """
+        try:
+            self._wait_until(lambda driver: driver.execute_script(condition, "#grid1_body_tbody", get("empty_grid_settle_ms")), timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    def _read_grid(self, selector = "#grid1_body_tbody"):
+        # One round trip per page: row count, first-row texts (page key) and the visible rows as trimmed strings
+        return self.driver.execute_script(
+            """
+            var tbody = document.querySelector(arguments[0]);
+            if (!tbody) return null;
+            var trs = tbody.getElementsByTagName("tr");
+            var first = [];
+            var rows = [];
+            for (var r = 0; r < trs.length; r++) {
+                var cells = trs[r].getElementsByTagName("td");
+                if (!cells.length) cells = trs[r].getElementsByTagName("th");
+                if (!cells.length) continue;
+                var values = [];
+                for (var i = 0; i < cells.length; i++) values.push(cells[i].textContent.trim());
+                if (r === 0) first = values;
+                var cell = cells[0];
+                var style = window.getComputedStyle(cell);
+                var visible = cell.getClientRects().length > 0 && style.visibility !== "hidden" && style.display !== "none";
+                if (visible) rows.push(values);
+            }
+            return {count: trs.length, first: first, rows: rows};
+            """,
+            selector
+        )
+
+    def _read_datalist(self):
+        # Whole result set from the WebSquare grid object, or None when the API is missing
+        # or only holds the current page (server-side paging) - then the caller pages the DOM
+        return self.driver.execute_script(
+            """
+            var gridId = arguments[0], pagingId = arguments[1], pageRows = arguments[2];
+            function component(id) {
+                try { if (window.$p && $p.getComponentById) { var c = $p.getComponentById(id); if (c) return c; } } catch (e) {}
+                return window[id] || null;
+            }
+            var grid = component(gridId);
+            if (!grid || typeof grid.getRowCount !== "function" || typeof grid.getColumnCount !== "function") return null;
+            var read = typeof grid.getCellDisplayData === "function" ? "getCellDisplayData" : "getCellData";
+            if (typeof grid[read] !== "function") return null;
+            var rowCount = grid.getRowCount(), colCount = grid.getColumnCount();
+
+            // The DataList must mirror the DOM columns, or row parsing would shift
+            var tbody = document.querySelector("#" + gridId + "_body_tbody");
+            var tr = tbody ? tbody.getElementsByTagName("tr")[0] : null;
+            if (tr && tr.getElementsByTagName("td").length !== colCount) return null;
+
+            var complete = rowCount > pageRows;
+            var paging = component(pagingId);
+            if (!complete && paging && typeof paging.getCount === "function") complete = paging.getCount() <= 1;
+            if (!complete) return null;
+
+            var rows = [];
+            for (var r = 0; r < rowCount; r++) {
+                var values = [];
+                for (var c = 0; c < colCount; c++) {
+                    var v = grid[read](r, c);
+                    values.push(v === null || v === undefined ? "" : String(v).trim());
+                }
+                rows.push(values);
+            }
+            return rows;
+            """,
+            get("grid_id"), get("paging_id"), get("page_rows")
+        )
+
+    def _is_last_page(self, page_num):
+        # Ask the paging component whether page_num (1-based, as read) is the last one; None when it cannot tell.
+        # Whether getSelectedIndex() counts from 0 or 1 is taken from the first page, and a pager that does not
+        # follow the pages actually read is not trusted
+        state = self.driver.execute_script(
+            """
+            var id = arguments[0], paging = null;
+            try { if (window.$p && $p.getComponentById) paging = $p.getComponentById(id); } catch (e) {}
+            paging = paging || window[id];
+            if (!paging || typeof paging.getCount !== "function" || typeof paging.getSelectedIndex !== "function") return null;
+            return [paging.getSelectedIndex(), paging.getCount()];
+            """,
+            get("paging_id")
+        )
+        if not state: return None
+        selected, count = state
+        if page_num == 1: self.pager_base = selected if selected in (0, 1) else None
+        if self.pager_base is None or selected - self.pager_base + 1 != page_num or count < page_num: return None
+        return page_num >= count
+
+    def _click_button(self, selector, in_iframe=False):
+        if in_iframe:
+            self._switch_to_popup()
+        
+        button = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+        self.driver.execute_script("arguments[0].click();", button)
+        if self.display:
+            print(f"CSS {selector} button clicked")
+        
+        if in_iframe:
+            self.driver.switch_to.default_content()
+            if self.display:
+                print(f"Switched back to main frame")
+
+    def _fill_input(self, selector, value, in_iframe=False):
+        if value is None: return
+        if in_iframe:
+            self._switch_to_popup()
+        input = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+        if self.display:
+            print(f"CSS {selector} input completed")
+        
+        # Use JavaScript click to bypass popup overlay
+        self.driver.execute_script("arguments[0].click();", input)
+        input.clear()
+        input.send_keys(value)
+        
+        if in_iframe:
+            self.driver.switch_to.default_content()
+            if self.display:
+                print(f"Switched back to main frame")
+    
+    def _fill_dates(self, config = None):
+        config = config or self.config
+        try:
+            self._fill_input(get("from_date_selector"), config.get('from_date'))
+            self._fill_input(get("to_date_selector"), config.get('to_date'))
+            self.filled_dates = (config.get('from_date'), config.get('to_date'))
+        except Exception as e: raise Exception(f"❌ 날짜 입력 실패: {e}")
+
+    def setup_driver(self, headless):
+        browser = "chrome"
+        long_timeout = get("long_loadtime")
+
+        try:
+            options = ChromeOptions()
+            if headless: options.add_argument("--headless=new")
+            self._apply_chrome_like_options(options)
+            path, cached = _driver_path()
+            try: driver = webdriver.Chrome(service=ChromeService(path), options=options)
+            except Exception:
+                if not cached: raise
+                # Chrome was updated past the cached driver: resolve again once
+                path, _ = _driver_path(refresh=True)
+                driver = webdriver.Chrome(service=ChromeService(path), options=options)
+            if self.display:
+                print("Chrome driver 로딩 완료")
+            if get("block_resources"): self._block_resources(driver)
+
+            driver.set_page_load_timeout(long_timeout)
+            wait = WebDriverWait(driver, long_timeout)
+            return driver, wait
+        except Exception as e: raise Exception(f"WebDriver 로딩 실패 ({browser}): {e}")
+
+    def _block_resources(self, driver):
+        # Requests matching blocked_urls fail inside Chrome before any bytes are transferred
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": get("blocked_urls")})
+        except Exception as e:
+            if self.display:
+                print(f"Resource blocking unavailable: {e}")
+
+    def _apply_chrome_like_options(self, options):
+        # Stability and crash prevention options
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-web-security")
+        options.add_argument("--disable-features=VizDisplayCompositor")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-plugins")
+        options.add_argument("--disable-images")
+        options.add_argument("--disable-default-apps")
+        options.add_argument("--disable-sync")
+        options.add_argument("--disable-translate")
+        
+        # Memory and performance options
+        options.add_argument("--memory-pressure-off")
+        options.add_argument("--max_old_space_size=4096")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-backgrounding-occluded-windows")
+        options.add_argument("--disable-renderer-backgrounding")
+        
+        # Logging and notifications
+        options.add_argument("--disable-notifications")
+        options.add_argument("--disable-logging")
+        options.add_argument("--log-level=3")
+        options.add_argument("--silent")
+        try:
+            options.add_experimental_option('excludeSwitches', ['enable-logging'])
+            options.add_experimental_option('useAutomationExtension', False)
+            # --disable-images is not a Chrome switch; the content setting is what stops image loads
+            if get("block_resources"):
+                options.add_experimental_option('prefs', {"profile.managed_default_content_settings.images": 2})
+        except Exception:
+            pass
+        
+        # Window and user agent
+        options.add_argument("--window-size=1600,1000")
+        options.add_argument(
+            "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
+        )
+
+def _driver_cache_file():
+    from export_results import _default_output_path
+    return _default_output_path(get("driver_cache"))
+
+def _driver_path(refresh = False):
+    # (chromedriver path, from_cache): cached path -> chromedriver on PATH -> webdriver_manager (network).
+    # None lets Selenium Manager resolve the driver when all of those fail.
+    cache_file = _driver_cache_file()
+    if not refresh:
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f: path = json.load(f).get("chromedriver")
+            if path and os.path.exists(path): return path, True
+        except (OSError, ValueError): pass
+    path = shutil.which("chromedriver")
+    if not path:
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+        except Exception as e:
+            print(f"ChromeDriverManager failed, falling back to Selenium Manager: {e}")
+            return None, False
+    try:
+        with open(cache_file, "w", encoding="utf-8") as f: json.dump({"chromedriver": path}, f)
+    except OSError: pass
+    return path, False
+
+def _started_scraper(base_config):
+    scraper = SCRAPER(base_config, headless=base_config.get("headless", True), display=base_config.get("display", False))
+    scraper.setup()
+    return scraper
+
+def prewarm(base_config, count):
+    # Launch `count` Chrome sessions in the background (e.g. while the workbook is prepared);
+    # returns a Queue of Futures that SCRAPE_LANEs take before starting a browser of their own
+    warm = queue.Queue()
+    if count <= 0: return warm
+    executor = ThreadPoolExecutor(max_workers=count)
+    for _ in range(count): warm.put(executor.submit(_started_scraper, base_config))
+    executor.shutdown(wait=False)
+    return warm
+
+def _take_warm(warm):
+    # A pre-warmed SCRAPER, or None when there is none left (or it failed to start)
+    while warm is not None:
+        try: future = warm.get_nowait()
+        except queue.Empty: return None
+        try: return future.result()
+        except Exception as e: print(f"Pre-warmed Chrome failed to start: {e}")
+    return None
+
+def discard_warm(warm):
+    # Quit the pre-warmed browsers nobody took
+    while True:
+        scraper = _take_warm(warm)
+        if scraper is None: return
+        scraper.cleanup()
+
+def fmtkey(key):
+    key=str(key).replace(' ','')
+    types_str = [
+        'EB', 'eb',
+        'CB', 'cb',
+        'BW', 'bw',
+    ]
+    for abbr in types_str: key=key.replace(abbr,'')
+    idx=key.find('(')
+    if idx!=-1: key=key[:idx]
+    return key
+
+# Grid column of each row field; values stay the grid's strings until export_results.typed_frame
+ROW_COLUMNS = {
+    # exc_start/exc_end (exercise period) are kept for the scheduler, not written to DB
+    "details": {"exc_start": 3, "exc_end": 4, "date": 5, "exc_amount": 6, "exc_shares": 8, "exc_price": 9, "listing_date": 10},
+    "prc": {"date": 1, "prv_prc": 5, "cur_prc": 6},
+}
+
+def build_row(values, url, config):
+    # Grid values (DOM) -> row dict of raw strings; a short row leaves the missing fields None
+    columns = ROW_COLUMNS["details" if url == get("details_url") else "prc"]
+    row_dict = {"title": config.get("keyword")}
+    for field, col in columns.items():
+        row_dict[field] = values[col] if col < len(values) else None
+    return row_dict
+
+def run_scrape_conv(scraper, config, url = get("details_url"), is_first_company_for_url = True, index = None):
+    # Traced wrapper: one "scrape" span plus the WebDriver commands / execute_script calls it cost
+    title = config.get("keyword")
+    commands, scripts = scraper.commands, scraper.scripts
+    scraper.units += 1
+    try:
+        with tracer.span("scrape", keyword=title, url=url):
+            return _scrape_conv(scraper, config, url, is_first_company_for_url, index)
+    finally:
+        tracer.count("webdriver_commands", scraper.commands - commands, keyword=title)
+        tracer.count("execute_script", scraper.scripts - scripts, keyword=title)
+
+def _failure_reason(stage, e):
+    # "stage: ExceptionType: first line of the message", for the failures report
+    message = (getattr(e, "msg", None) or str(e)).strip()
+    return f"{stage}: {type(e).__name__}" + (f": {message.splitlines()[0]}" if message else "")
+
+def _scrape_conv(scraper, config, url, is_first_company_for_url, index):
+    print(f"\nStarting scrape for company: {config['company']}")
+    title = config.get("keyword")
+    stage = "navigate"
+    try:
+        # 1. Navigate to the main page (only if URL changed or first company)
+        with tracer.span("navigate", keyword=title):
+            if is_first_company_for_url:
+                scraper.driver.get(url)
+                scraper.filled_dates = None
+                scraper._wait_page_ready()
+
+        # 2-5. Find the issue in the popup: in the list a sibling bond's search left open, by its indexed
+        # ISIN (one exact hit), else by company name - which also indexes every sibling bond of the company
+        stage = "isin_search"
+        with tracer.span("isin_search", keyword=title):
+            entry = index.get(config) if index else None
+            if entry is None and index and config.get("await_index"):
+                entry = index.wait_for(config, config["await_index"]) # the paired screen is resolving it
+            found = None
+            if entry:
+                if entry.get("isin"): is_entry = lambda text, row_text: entry["isin"] in row_text
+                else: is_entry = lambda text, row_text: text == entry["text"]
+                found = scraper._search_popup(None, is_entry, get("poll_time"))
+                if not found and entry.get("isin"):
+                    found = scraper._search_popup(entry["isin"], is_entry, get("short_loadtime"))
+                if not found:
+                    print("Stale ISIN index entry, searching by company")
+                    index.drop(config)
+            if not found:
+                keyword = fmtkey(config.get("keyword"))
+                siblings = {fmtkey(k): k for k in config.get("siblings") or [config.get("keyword")]}
+                siblings[keyword] = config.get("keyword")
+                listed = scraper._search_popup(config["company"], lambda text, row_text: fmtkey(text) in siblings)
+                found = [item for item in listed or [] if fmtkey(item[1]) == keyword]
+                if not found:
+                    # Only a list showing this company's other LIST bonds is a permanent miss; anything else on
+                    # screen after a slow search may still be the previous company's list
+                    if listed: raise ISSUE_NOT_FOUND(f"{config.get('keyword')} is not listed for {config['company']}")
+                    raise TimeoutException(f"No ISIN list for {config['company']}")
+                if index:
+                    for sibling_key, sibling in siblings.items():
+                        first = next((item for item in listed if fmtkey(item[1]) == sibling_key), None)
+                        if first: index.put({"keyword": sibling, "company": config["company"]}, first[2], first[0], first[1])
+            target, text, row_text = found[0] # Use first match - error prevention
+            print(f"Found match: position {target}")
+            if len(found) > 1:
+                print("Multiple matches found")
+            scraper._click_button(f"#isinList_{target}_ISIN_ROW", in_iframe=True)
+            scraper._wait_popup_closed()
+
+        # 6. Fill the dates (only if URL changed, first company or a different window for this issue)
+        stage = "fill_dates"
+        with tracer.span("fill_dates", keyword=title):
+            if is_first_company_for_url or scraper.filled_dates != (config.get("from_date"), config.get("to_date")):
+                scraper._fill_dates(config)
+
+        # 7. Click the search button and wait for the grid to redraw
+        stage = "search"
+        with tracer.span("search", keyword=title):
+            scraper._mark_grid()
+            scraper._click_button("#image2")
+            # Reading an unchanged grid would return the previous issue's rows under this keyword
+            if not scraper._wait_grid_changed():
+                raise TimeoutException(f"Grid not redrawn after search for {title}")
+
+        # 8. Scrape the data - in one call when the grid's DataList holds the full result set
+        stage = "grid"
+        with tracer.span("grid", keyword=title):
+            try: data = scraper._read_datalist()
+            except Exception: data = None
+            if data is not None:
+                scraper.pages += 1
+                print(f"Read {len(data)} rows from the grid DataList")
+                return [build_row(values, url, config) for values in data if values and values[0] != ""]
+
+            all_rows_dicts = []
+            previous_page_key = None
+            page_num = 1
+            # Only "no next page" ends paging; any WebDriver error reaches the handler below, so a
+            # truncated result is never returned (and merged into the cache) as a success
+            while True:
+                grid = scraper._read_grid()
+                if grid is None:
+                    if page_num == 1: break # no grid body: no rows
+                    raise WebDriverException(f"Grid body missing on page {page_num}")
+                scraper.pages += 1
+                page_key = "|".join(grid["first"]) if grid["count"] else None
+                if previous_page_key is not None and page_key == previous_page_key: break # same page, stop
+
+                data_dicts = []
+                for values in grid["rows"]:
+                    if not values or values[0] == "": 
+                        continue
+                    data_dicts.append(build_row(values, url, config))
+                all_rows_dicts.extend(data_dicts)
+                previous_page_key = page_key
+                # A short page is the last one; a full page is only known to be last from the pager, otherwise
+                # the next click has to time out
+                if grid["count"] < get("page_rows"): break
+                last_page = scraper._is_last_page(page_num)
+                if last_page: break
+
+                scraper._mark_grid()
+                scraper._click_button(f"#{get('paging_id')}_next_btn")
+                if not scraper._wait_grid_changed(get("short_loadtime")):
+                    if last_page is None: break # no pager: nothing redrawn means this was the last page
+                    # The pager says more pages follow; returning now would cache a truncated history
+                    raise TimeoutException(f"Page {page_num + 1} not drawn for {title}")
+                page_num += 1
+            return all_rows_dicts
+    except Exception as e:
+        # failed, as opposed to [] for "no data"; the lane decides whether to retry
+        config["failure"] = _failure_reason(stage, e)
+        config["permanent"] = isinstance(e, ISSUE_NOT_FOUND)
+        print(f"Scrape failed: {config['failure']}")
+        return None
+
+def plan_by_company(items):
+    # Group LIST (keyword, company) rows by company, in order of first appearance: [[(i, item), ...], ...]
+    groups = {}
+    for i, item in enumerate(items):
+        groups.setdefault(item[1], []).append((i, item))
+    return list(groups.values())
+
+def _date_windows(from_date, to_date, days):
+    # [from_date, to_date] as consecutive non-overlapping windows of `days` days, newest first
+    if not days or from_date >= to_date: return [(from_date, to_date)]
+    start = datetime.datetime.strptime(from_date, "%Y%m%d")
+    end = datetime.datetime.strptime(to_date, "%Y%m%d")
+    windows = []
+    while end >= start:
+        window_start = max(start, end - datetime.timedelta(days=days - 1))
+        windows.append((window_start.strftime("%Y%m%d"), end.strftime("%Y%m%d")))
+        end = window_start - datetime.timedelta(days=1)
+    return windows
+
+def plan_windows(base_config, items, urls, cache = None, done = None):
+    # (url, i) -> date windows still to fetch, newest first; units finished by an earlier run are left out.
+    # Issues not known to be long stay one window: each window costs its own popup pass, date fill and search
+    long_rows = get("page_rows") * get("window_min_pages")
+    plan = {}
+    for url in urls:
+        for i, item in enumerate(items):
+            if done and (url, i) in done: continue
+            start = cache.start_date(url, item[0], base_config["from_date"]) if cache else base_config["from_date"]
+            days = get("window_days") if cache and cache.row_count(url, item[0]) > long_rows else 0
+            plan[(url, i)] = _date_windows(start, base_config["to_date"], days)
+    return plan
+
+def pool_workers(items, plan, workers):
+    # Workers that can all get work: one per company, plus one per extra window of the most split issue
+    most_windows = max([len(windows) for windows in plan.values()] or [1])
+    return max(1, min(workers, len(plan_by_company(items)) + most_windows - 1))
+
+def _split_shares(items, workers, windows = None):
+    # Round-robin split of whole companies, so every bond of a company is scraped by the same worker
+    # right after the others and can reuse its popup search: [[(i, item, window), ...] per worker].
+    # windows: {i: number of date windows}; window w of an issue goes to the worker w places after
+    # its company's, so the windows of one issue are fetched side by side
+    shares = [[] for _ in range(workers)]
+    for g, group in enumerate(plan_by_company(items)):
+        for i, item in group:
+            for w in range(windows.get(i, 0) if windows is not None else 1):
+                shares[(g + w) % workers].append((i, item, w))
+    return shares
+
+class SCRAPE_LANE:
+    # One worker's browser session, started lazily, with its own per-url is_first_company_for_url state.
+    # Fetches config's from_date..to_date as given; the pool applies the cache and merges windows.
+    def __init__(self, base_config, cache = None, index = None, warm = None):
+        self.base_config = base_config
+        self.warm = warm
+        self.cache = cache
+        self.index = index
+        self.scraper = None
+        self.navigated = set()
+        self.company = None
+
+    def cleanup(self):
+        if self.scraper: self.scraper.cleanup()
+
+    def _restart_scraper(self):
+        # Fresh Chrome in place of the current one; counters carry over for the run's stats, and every url
+        # is navigated (and its dates filled) again since the new browser has no page open
+        old = self.scraper
+        old.cleanup()
+        self.scraper = _started_scraper(self.base_config)
+        self.scraper.commands += old.commands
+        self.scraper.scripts += old.scripts
+        self.scraper.pages += old.pages
+        self.navigated.clear()
+
+    def _recover(self, url):
+        # After a failure the page is in an unknown state: reload it next attempt, and replace a dead browser
+        self.navigated.discard(url)
+        if self.scraper is not None and not self.scraper.alive():
+            print("Chrome session lost, starting a new one")
+            self._restart_scraper()
+
+    def _recycle_if_needed(self, config):
+        # Only between companies, so sibling bonds still reuse the popup list of the same browser
+        company, self.company = self.company, config["company"]
+        if self.scraper is None or company is None or company == config["company"]: return
+        units, max_units = self.scraper.units, get("recycle_units")
+        rss, max_rss = (self.scraper.memory_mb() if get("recycle_rss_mb") else None), get("recycle_rss_mb")
+        if rss is not None: tracer.count("browser_rss_mb", round(rss), keyword=config["keyword"])
+        if (max_units and units >= max_units) or (rss is not None and rss >= max_rss):
+            print(f"Recycling Chrome after {units} issues" + (f" at {rss:.0f} MB" if rss is not None else ""))
+            with tracer.span("recycle", units=units, rss_mb=None if rss is None else round(rss)):
+                try: self._restart_scraper()
+                except Exception as e:
+                    print(f"Chrome restart failed: {e}")
+                    self.scraper = None # started again on the next attempt
+
+    def _scrape_browser(self, url, config):
+        # Retries transient failures with exponential backoff until retries or unit_deadline run out;
+        # a failed rows=None leaves config["failure"] (reason) and config["attempts"] for the report
+        deadline = time.monotonic() + get("unit_deadline")
+        delay = get("retry_backoff")
+        for attempt in range(1, get("retries") + 2):
+            config["attempts"] = attempt
+            try:
+                if self.scraper is None:
+                    self.scraper = _take_warm(self.warm) or _started_scraper(self.base_config)
+                rows = run_scrape_conv(self.scraper, config, url, is_first_company_for_url=(url not in self.navigated), index=self.index)
+                self.navigated.add(url)
+            except Exception as e:
+                config["failure"] = _failure_reason("browser", e)
+                rows = None
+            if rows is not None:
+                config.pop("failure", None)
+                return rows
+            if config.get("permanent") or time.monotonic() + delay > deadline: return None
+            try: self._recover(url)
+            except Exception as e:
+                config["failure"] = _failure_reason("recover", e)
+                self.scraper = None
+            time.sleep(delay)
+            delay *= 2
+        return None
+
+    def scrape(self, url, config):
+        self._recycle_if_needed(config)
+        return self._scrape_browser(url, config)
+
+def run_scrape_pool(base_config, items, urls, workers = None, is_running = None, on_result = None, cache = None, index = None, paired = None, stats = None, warm = None, done = None, plan = None):
+    # Scrape (keyword, company) items on every url with a pool of headless SCRAPER workers.
+    # Each worker owns its driver, its share of the items and its is_first_company_for_url state.
+    # paired: each worker keeps one lane per url and scrapes an issue's screens at the same time;
+    # the first url resolves the ISIN and the others pick it up from the shared index.
+    # warm: Queue from prewarm() whose browsers the lanes use first.
+    # done: (url, i) units finished by an earlier run; they are skipped and keep results[url][i] = None.
+    # stats, if given, receives the WebDriver "commands" and grid "pages" totals of all lanes.
+    # With a SCRAPE_CACHE only the range after each issue's watermark is fetched and merged into its history.
+    # plan: plan_windows() result, computed here when not given. A long issue's date windows are spread
+    # over the workers (the pool is sized by these units, not by companies); an issue is
+    # published once all its windows are in, merged newest first without duplicate rows, or as failed
+    # (its cached history, if any) when one of them failed.
+    # on_result(url, i, config, rows) runs on the calling thread as issues complete, so a slow consumer
+    # (journal fsync, checkpoint flush) never holds up the workers.
+    # Returns {url: [rows per item]} in LIST order so the merge does not depend on timing.
+    if workers is None: workers = get("workers")
+    if paired is None: paired = get("paired_screens")
+    if plan is None: plan = plan_windows(base_config, items, urls, cache, done)
+    workers = pool_workers(items, plan, workers)
+    results = {url: [None] * len(items) for url in urls}
+    lock = threading.Lock()
+    published = queue.Queue() # completed (url, i, config, rows), drained below
+
+    siblings = {}
+    for item in items: siblings.setdefault(item[1], []).append(item[0])
+
+    parts = {unit: {} for unit in plan}
+    windows = {i: max([len(plan[(url, i)]) for url in urls if (url, i) in plan] or [0]) for i in range(len(items))}
+
+    def make_config(url, item, window):
+        config = base_config.copy()
+        config["keyword"] = item[0]
+        config["company"] = item[1]
+        config["siblings"] = siblings[item[1]]
+        config["from_date"], config["to_date"] = window
+        if paired and index and url != urls[0]: config["await_index"] = get("long_loadtime")
+        return config
+
+    def collect(url, i, w, config, rows):
+        # Keep a window's rows; the last window of an issue merges and publishes it
+        with lock:
+            unit = parts[(url, i)]
+            unit[w] = (config, rows)
+            if len(unit) < len(plan[(url, i)]): return
+            fetched = [unit[n] for n in range(len(unit))]
+        # Only the thread that completed the issue gets here
+        config = dict(fetched[0][0], from_date=plan[(url, i)][-1][0], to_date=base_config["to_date"])
+        failed = next((window_config for window_config, window_rows in fetched if window_rows is None), None)
+        if failed is not None:
+            config["failure"], config["attempts"] = failed.get("failure", "unknown"), failed.get("attempts")
+            rows = cache.history(url, config["keyword"]) if cache else None # keep what we had
+        else:
+            rows, seen = [], set()
+            for window_config, window_rows in fetched:
+                for row in window_rows:
+                    key = tuple(row.items())
+                    if key in seen: continue
+                    seen.add(key)
+                    rows.append(row)
+            if cache: rows = cache.merge(url, config["keyword"], rows, config["from_date"], config["to_date"])
+        results[url][i] = rows
+        published.put((url, i, config, rows))
+
+    def worker(share):
+        lanes = []
+        try:
+            if paired:
+                by_url = {}
+                for url in urls:
+                    by_url[url] = SCRAPE_LANE(base_config, cache, index, warm)
+                    lanes.append(by_url[url])
+                with ThreadPoolExecutor(max_workers=len(urls)) as screens:
+                    for i, item, w in share:
+                        if is_running and not is_running(): return
+                        todo = [url for url in urls if (url, i) in plan and w < len(plan[(url, i)])]
+                        configs = {url: make_config(url, item, plan[(url, i)][w]) for url in todo}
+                        futures = {url: screens.submit(by_url[url].scrape, url, configs[url]) for url in todo}
+                        for url in todo: collect(url, i, w, configs[url], futures[url].result())
+            else:
+                lane = SCRAPE_LANE(base_config, cache, index, warm)
+                lanes.append(lane)
+                for url in urls:
+                    for i, item, w in share:
+                        if is_running and not is_running(): return
+                        if (url, i) not in plan or w >= len(plan[(url, i)]): continue
+                        config = make_config(url, item, plan[(url, i)][w])
+                        collect(url, i, w, config, lane.scrape(url, config))
+        finally:
+            for lane in lanes:
+                lane.cleanup()
+                if stats is not None and lane.scraper:
+                    with lock:
+                        stats["commands"] = stats.get("commands", 0) + lane.scraper.commands
+                        stats["pages"] = stats.get("pages", 0) + lane.scraper.pages
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(worker, share) for share in _split_shares(items, workers, windows)]
+        while True:
+            try: unit = published.get(timeout=0.1)
+            except queue.Empty:
+                if all(future.done() for future in futures) and published.empty(): break
+                continue
+            if on_result: on_result(*unit)
+        for future in futures: future.result()
+    return results
@@ -0,0 +1,14 @@
+import pandas as pd
+
+from analytics import exercise_overhang
+
+def test_overhang_uses_issue_amount_not_later_exercises():
+    db = pd.DataFrame({"title": ["A 1CB"] * 3 + ["B 1CB"], "date": pd.to_datetime(["2025-01-10", "2025-02-10", "2025-03-10", "2025-01-10"]),
+                       "exc_amount": [1000.0, 2000.0, 1000.0, 500.0], "exc_shares": [100, 200, 125, 50], "exc_price": [10.0, 10.0, 8.0, 10.0]})
+    ex = pd.DataFrame({"title": ["A 1CB"], "date": pd.to_datetime(["2025-03-01"]), "prv_prc": [10.0], "cur_prc": [8.0]})
+    df = exercise_overhang(db, ex, {"A 1CB": 10000.0})
+    a = df[df["title"] == "A 1CB"]
+    assert list(a["remaining_amount"]) == [9000.0, 7000.0, 6000.0]
+    # exc_price before the first reset, the reset price after it
+    assert list(a["overhang_shares"]) == [900.0, 700.0, 750.0]
+    assert df[df["title"] == "B 1CB"]["overhang_shares"].isna().all() # no issue amount given
@@ -0,0 +1,37 @@
+from seibro_scraper import _date_windows, _split_shares, plan_windows, pool_workers, get
+from scrape_cache import SCRAPE_CACHE
+
+URL = "details"
+BASE = {"from_date": "20210101", "to_date": "20251231"}
+
+def _cache(tmp_path, rows_by_keyword):
+    cache = SCRAPE_CACHE(str(tmp_path / "scrape_cache.json"), refresh=True)
+    for keyword, count in rows_by_keyword.items():
+        rows = [{"title": keyword, "date": f"2025/01/{n % 28 + 1:02d}", "n": str(n)} for n in range(count)]
+        cache.merge(URL, keyword, rows, "20210101", "20251231")
+    return cache
+
+def test_windows_are_contiguous_and_newest_first():
+    windows = _date_windows("20210101", "20230315", 365)
+    assert windows == [("20220316", "20230315"), ("20210316", "20220315"), ("20210101", "20210315")]
+    assert _date_windows("20250901", "20251001", 365) == [("20250901", "20251001")]
+    assert _date_windows("20210101", "20251231", 0) == [("20210101", "20251231")]
+
+def test_only_issues_known_to_be_long_are_split(tmp_path):
+    items = [["busy 1CB", "busy"], ["quiet 1CB", "quiet"], ["new 1CB", "new"]]
+    long_rows = get("page_rows") * get("window_min_pages")
+    cache = _cache(tmp_path, {"busy 1CB": long_rows + 1, "quiet 1CB": 3})
+    plan = plan_windows(BASE, items, [URL], cache)
+    assert len(plan[(URL, 0)]) == 6 # 2021..2025 in 365-day windows, leap days included
+    assert len(plan[(URL, 1)]) == 1
+    assert len(plan[(URL, 2)]) == 1
+    assert len(plan_windows(BASE, items, [URL])[(URL, 0)]) == 1 # no cache: nothing known to be long
+
+def test_single_busy_issue_spreads_over_workers(tmp_path):
+    items = [["busy 1CB", "busy"]]
+    cache = _cache(tmp_path, {"busy 1CB": 1000})
+    plan = plan_windows(BASE, items, [URL], cache)
+    workers = pool_workers(items, plan, 3)
+    assert workers == 3
+    shares = _split_shares(items, workers, {0: len(plan[(URL, 0)])})
+    assert [len(share) for share in shares] == [2, 2, 2]
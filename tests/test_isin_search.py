@@ -0,0 +1,23 @@
+from seibro_scraper import SCRAPER, _scrape_conv, get
+
+def _scraper(listed):
+    # A page whose company search returns `listed`; reopening the popup shows the previous company's list
+    scraper = object.__new__(SCRAPER)
+    def search_popup(query, match, timeout = None):
+        if query is None: return [(0, "다른회사 1CB", "KR6000000009 다른회사 1CB")]
+        return listed
+    scraper._search_popup = search_popup
+    return scraper
+
+def _config():
+    return {"keyword": "에스티팜 2CB", "company": "에스티팜", "siblings": ["에스티팜 2CB", "에스티팜 3CB"]}
+
+def test_slow_company_search_is_retried_not_permanent():
+    config = _config()
+    assert _scrape_conv(_scraper(None), config, get("details_url"), False, None) is None
+    assert config["permanent"] is False and "Timeout" in config["failure"]
+
+def test_bond_missing_beside_its_siblings_is_permanent():
+    config = _config()
+    assert _scrape_conv(_scraper([(1, "에스티팜 3CB", "KR6000000003 에스티팜 3CB")]), config, get("details_url"), False, None) is None
+    assert config["permanent"] is True
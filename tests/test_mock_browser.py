@@ -0,0 +1,36 @@
+import shutil
+
+import pytest
+
+import seibro_scraper
+from mock_seibro import MOCK_DATA, serve
+from seibro_scraper import SCRAPER, SYSCONST, run_scrape_conv
+
+# Against mock_seibro in headless Chrome; skipped where no Chrome is installed
+
+@pytest.fixture
+def mock_screens(monkeypatch):
+    if not any(shutil.which(name) for name in ("google-chrome", "chromium", "chromium-browser", "chrome")):
+        pytest.skip("Chrome is not installed")
+    server, base_url = serve(MOCK_DATA(2, details_rows=30, prc_rows=0), pager_base=0)
+    monkeypatch.setitem(SYSCONST, "details_url", f"{base_url}/websquare/control.jsp?w2xPath=/IPORTAL/user/bond/BIP_CNTS03024V.xml")
+    monkeypatch.setitem(SYSCONST, "prc_url", f"{base_url}/websquare/control.jsp?w2xPath=/IPORTAL/user/bond/BIP_CNTS03025V.xml")
+    scraper = SCRAPER({}, headless=True)
+    scraper.setup()
+    yield scraper
+    scraper.cleanup()
+    server.shutdown()
+
+def _config(n):
+    return {"keyword": f"회사000{n} 1CB", "company": f"회사000{n}", "from_date": "20210101", "to_date": "20251001"}
+
+def test_empty_results_are_not_timeouts(mock_screens):
+    # No EX resets for either issue: an empty grid is searched into an empty grid twice
+    for n, first in [(1, True), (2, False)]:
+        config = _config(n)
+        assert run_scrape_conv(mock_screens, config, SYSCONST["prc_url"], first) == []
+        assert "failure" not in config
+
+def test_full_last_page_ends_paging_by_the_pager(mock_screens):
+    rows = run_scrape_conv(mock_screens, _config(1), SYSCONST["details_url"], True)
+    assert len(rows) == 30
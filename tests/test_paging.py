@@ -0,0 +1,33 @@
+import pytest
+
+from seibro_scraper import SCRAPER, get
+
+class PAGER_DRIVER:
+    # Stands in for window.gridPaging of a result with `rows` rows, as mock_seibro serves it
+    def __init__(self, rows, base, follows = True):
+        self.count = max(1, -(-rows // get("page_rows")))
+        self.base = base
+        self.follows = follows
+        self.page = 0
+
+    def execute_script(self, script, *args):
+        return [(self.page if self.follows else 0) + self.base, self.count]
+
+def _pages_read(driver):
+    scraper = object.__new__(SCRAPER)
+    scraper.driver = driver
+    scraper.pager_base = None
+    answers = []
+    for page_num in range(1, driver.count + 1):
+        driver.page = page_num - 1
+        answers.append(scraper._is_last_page(page_num))
+    return answers
+
+@pytest.mark.parametrize("base", [0, 1])
+def test_full_last_page_is_recognised_for_either_index_base(base):
+    # 15 x k rows: the last page is full, so only the pager can end paging without a timeout
+    assert _pages_read(PAGER_DRIVER(2 * get("page_rows"), base)) == [False, True]
+    assert _pages_read(PAGER_DRIVER(get("page_rows"), base)) == [True]
+
+def test_pager_that_does_not_follow_the_pages_is_not_trusted():
+    assert _pages_read(PAGER_DRIVER(3 * get("page_rows"), 0, follows=False)) == [False, None, None]
@@ -0,0 +1,34 @@
+import os
+
+import seibro_scraper
+from benchmark import make_workbook
+from pipeline import run_pipeline
+
+ITEMS = [["에스티팜 2CB", "에스티팜"], ["없는회사 1CB", "없는회사"]]
+
+def _pool(fetched):
+    # run_scrape_pool stand-in: the second issue is never found
+    def run_scrape_pool(base_config, items, urls, on_result = None, plan = None, **kwargs):
+        for url in urls:
+            for i, item in enumerate(items):
+                if (url, i) not in plan: continue
+                fetched.append((base_config["to_date"], url, i))
+                config = dict(base_config, keyword=item[0], company=item[1])
+                if i == 1: config.update(failure="ISSUE_NOT_FOUND", permanent=True)
+                on_result(url, i, config, None if i == 1 else [])
+    return run_scrape_pool
+
+def test_completed_run_with_failures_is_not_resumed(tmp_path, monkeypatch):
+    output_path = str(tmp_path / "results.xlsx")
+    make_workbook(output_path, ITEMS)
+    fetched = []
+    monkeypatch.setattr(seibro_scraper, "run_scrape_pool", _pool(fetched))
+    monkeypatch.setattr(seibro_scraper, "prewarm", lambda *args: None)
+    emit = lambda event, **fields: None
+    first = run_pipeline(emit, output_path=output_path, to_date="20251017")
+    assert first["status"] == "completed" and first["failed"] == 2
+    assert not os.path.exists(tmp_path / seibro_scraper.get("journal_file"))
+    fetched.clear()
+    second = run_pipeline(emit, output_path=output_path)
+    assert second["resumed"] == 0
+    assert len(fetched) == 4 and all(to_date != "20251017" for to_date, url, i in fetched)
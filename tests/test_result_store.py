@@ -0,0 +1,35 @@
+from result_store import RESULT_STORE
+
+def _exercise(listing_date):
+    return {"title": "에스티팜 2CB", "date": "2025/09/09", "exc_amount": "2,800,105,088", "exc_shares": "35,156",
+            "exc_price": "79,648", "listing_date": listing_date}
+
+def test_pending_listing_date_is_upserted_not_duplicated(tmp_path):
+    store = RESULT_STORE(str(tmp_path / "results.sqlite"))
+    for _ in range(3): store.upsert([_exercise("")], "DB")
+    assert len(store.query("DB")) == 1
+
+    store.upsert([_exercise("2025/09/22")], "DB")
+    df = store.query("DB")
+    assert len(df) == 1
+    assert df["listing_date"].iloc[0].strftime("%Y%m%d") == "20250922"
+
+    # A later fetch showing the cell empty again keeps the known listing date
+    store.upsert([_exercise("")], "DB")
+    assert store.query("DB")["listing_date"].iloc[0].strftime("%Y%m%d") == "20250922"
+    store.close()
+
+def test_price_reset_with_empty_price_is_upserted(tmp_path):
+    store = RESULT_STORE(str(tmp_path / "results.sqlite"))
+    for _ in range(2): store.upsert([{"title": "A 1CB", "date": "2025/01/02", "prv_prc": "", "cur_prc": "10,000"}], "EX")
+    store.upsert([{"title": "A 1CB", "date": "2025/01/02", "prv_prc": "11,000", "cur_prc": "10,000"}], "EX")
+    df = store.query("EX")
+    assert len(df) == 1
+    assert df["prv_prc"].iloc[0] == 11000.0
+    store.close()
+
+def test_rows_with_empty_key_are_not_stored(tmp_path):
+    store = RESULT_STORE(str(tmp_path / "results.sqlite"))
+    assert store.upsert([dict(_exercise("2025/09/22"), date="")], "DB") == 0
+    assert store.query("DB").empty
+    store.close()
@@ -0,0 +1,45 @@
+import json
+
+from scrape_cache import RUN_JOURNAL
+
+ITEMS = [["에스티팜 2CB", "에스티팜"], ["알테오젠 1CB", "알테오젠"]]
+ROWS = [{"title": "에스티팜 2CB", "date": "2025/01/02"}]
+
+def _interrupted(path, to_date = "20251017"):
+    journal = RUN_JOURNAL(str(path))
+    journal.open({"from_date": "20210101", "to_date": to_date}, ITEMS)
+    journal.record("details", 0, ITEMS[0][0], ROWS)
+    journal.close()
+
+def test_resume_after_midnight_keeps_the_original_to_date(tmp_path):
+    path = tmp_path / "run_journal.jsonl"
+    _interrupted(path)
+    config = {"from_date": "20210101", "to_date": "20251018"} # the rerun's "today"
+    journal = RUN_JOURNAL(str(path))
+    assert journal.open(config, ITEMS) == {("details", 0): ROWS}
+    assert config["to_date"] == "20251017"
+    journal.close()
+    assert json.loads(path.read_text(encoding="utf-8").split("\n")[0])["to_date"] == "20251017"
+
+def test_explicit_other_to_date_or_list_starts_over(tmp_path):
+    path = tmp_path / "run_journal.jsonl"
+    _interrupted(path)
+    journal = RUN_JOURNAL(str(path))
+    config = {"from_date": "20210101", "to_date": "20251231"}
+    assert journal.open(config, ITEMS, to_date="20251231") == {}
+    assert journal.discarded == 1 and config["to_date"] == "20251231"
+    journal.close()
+    _interrupted(path)
+    assert journal.open({"from_date": "20210101", "to_date": "20251017"}, ITEMS[:1]) == {}
+    journal.close()
+
+def test_torn_last_line_is_dropped(tmp_path):
+    path = tmp_path / "run_journal.jsonl"
+    _interrupted(path)
+    with open(path, "a", encoding="utf-8") as f: f.write('{"url": "prc", "i": 1, "keyw')
+    journal = RUN_JOURNAL(str(path))
+    assert journal.open({"from_date": "20210101", "to_date": "20251017"}, ITEMS) == {("details", 0): ROWS}
+    journal.record("prc", 1, ITEMS[1][0], [])
+    journal.close()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3 and all(json.loads(line) for line in lines)
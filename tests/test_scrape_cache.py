@@ -0,0 +1,19 @@
+from scrape_cache import SCRAPE_CACHE
+
+def _row(date, listing_date):
+    return {"title": "에스티팜 2CB", "date": date, "exc_shares": "35,156", "exc_price": "79,648", "listing_date": listing_date}
+
+def test_fetch_starts_at_a_row_still_missing_its_listing_date(tmp_path):
+    cache = SCRAPE_CACHE(str(tmp_path / "scrape_cache.json"), overlap_days=7)
+    cache.merge("details", "에스티팜 2CB", [_row("2025/09/30", ""), _row("2025/09/09", None), _row("2025/06/02", None)], "20210101", "20251001")
+    # 2025/09/09 is pending and within 60 days; 2025/06/02 has been given up on
+    assert cache.start_date("details", "에스티팜 2CB", "20210101") == "20250909"
+    cache.merge("details", "에스티팜 2CB", [_row("2025/09/30", "2025/10/14"), _row("2025/09/09", "2025/09/22")], "20250909", "20251001")
+    assert cache.start_date("details", "에스티팜 2CB", "20210101") == "20250924"
+
+def test_merge_replaces_the_fetched_window_only(tmp_path):
+    cache = SCRAPE_CACHE(str(tmp_path / "scrape_cache.json"))
+    cache.merge("details", "A", [_row("2025/09/30", "x"), _row("2025/01/02", "x")], "20210101", "20251001")
+    history = cache.merge("details", "A", [_row("2025/09/30", "y")], "20250901", "20251001")
+    assert [(row["date"], row["listing_date"]) for row in history] == [("2025/09/30", "y"), ("2025/01/02", "x")]
+    assert cache.row_count("details", "A") == 2 and cache.start_date("details", "A", "20210101") == "20250924"
@@ -0,0 +1,26 @@
+import threading
+
+import seibro_scraper
+from seibro_scraper import run_scrape_pool
+
+class FAKE_LANE:
+    # SCRAPE_LANE without a browser: one row per fetch
+    def __init__(self, *args):
+        self.scraper = None
+    def setup(self): pass
+    def cleanup(self): pass
+    def scrape(self, url, config):
+        return [{"title": config["keyword"], "date": config["to_date"]}]
+
+def test_results_are_published_on_the_calling_thread(monkeypatch):
+    monkeypatch.setattr(seibro_scraper, "SCRAPE_LANE", FAKE_LANE)
+    items = [[f"회사{n} 1CB", f"회사{n}"] for n in range(6)]
+    published, threads = [], set()
+    def on_result(url, i, config, rows):
+        threads.add(threading.current_thread())
+        published.append((url, i))
+    results = run_scrape_pool({"from_date": "20250101", "to_date": "20251001"}, items, ["details", "prc"],
+                              workers=3, on_result=on_result, paired=False)
+    assert threads == {threading.current_thread()}
+    assert sorted(published) == sorted((url, i) for url in ["details", "prc"] for i in range(6))
+    assert results["prc"][5] == [{"title": "회사5 1CB", "date": "20251001"}]
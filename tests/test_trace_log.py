@@ -0,0 +1,17 @@
+from trace_log import TRACER
+
+def test_gauges_report_their_peak_and_counters_their_total():
+    tracer = TRACER()
+    for keyword, rss, commands in [("A 1CB", 300, 10), ("B 1CB", 450, 12), ("C 1CB", 420, 8)]:
+        tracer.count("browser_rss_mb", rss, keyword=keyword)
+        tracer.count("webdriver_commands", commands, keyword=keyword)
+    stages, counters = tracer.summary()
+    assert counters == {"browser_rss_mb": 450, "webdriver_commands": 30}
+    assert "browser_rss_mb: 450 (최대)" in tracer.summary_lines()
+
+def test_write_with_reset_starts_an_empty_trace(tmp_path):
+    tracer = TRACER()
+    with tracer.span("scheduled_refresh", keyword="A 1CB"): pass
+    tracer.write(str(tmp_path / "trace.json"), reset=True)
+    assert tracer.events == []
+    assert '"scheduled_refresh"' in (tmp_path / "trace.json").read_text(encoding="utf-8")
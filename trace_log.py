@@ -0,0 +1,73 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+class TRACER:
+    # Spans and counters for one run, exported as Chrome trace (.json) or JSON lines (.jsonl)
+    # Counters are per-unit amounts summed in summary(), except the GAUGES, which sample a level
+    # (memory after each unit) and are summarised by their peak
+    GAUGES = {"browser_rss_mb"}
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.origin = time.perf_counter()
+            self.events = []
+
+    @contextmanager
+    def span(self, name, **args):
+        start = time.perf_counter()
+        try: yield
+        finally:
+            end = time.perf_counter()
+            event = {"name": name, "ph": "X", "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6,
+                     "pid": os.getpid(), "tid": threading.get_ident(), "args": args}
+            with self.lock: self.events.append(event)
+
+    def count(self, name, value, keyword = None):
+        # Counter tracks are split per keyword ("id") so they plot as separate series
+        event = {"name": name, "ph": "C", "ts": (time.perf_counter() - self.origin) * 1e6,
+                 "pid": os.getpid(), "tid": threading.get_ident(), "args": {"value": value}}
+        if keyword is not None: event["id"] = keyword
+        with self.lock: self.events.append(event)
+
+    def write(self, path, reset: bool = False):
+        # reset: start a new trace with the events written, so a run that never ends keeps a bounded buffer
+        with self.lock:
+            events = list(self.events)
+            if reset: self.origin, self.events = time.perf_counter(), []
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                for event in events: f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            else: json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        return os.path.abspath(path)
+
+    def summary(self):
+        # {stage: {"count", "total", "mean", "max"}} in seconds, and counter totals (gauge peaks), slowest stage first
+        with self.lock: events = list(self.events)
+        stages = {}
+        counters = {}
+        for event in events:
+            if event["ph"] == "X":
+                stage = stages.setdefault(event["name"], {"count": 0, "total": 0.0, "max": 0.0})
+                stage["count"] += 1
+                stage["total"] += event["dur"] / 1e6
+                stage["max"] = max(stage["max"], event["dur"] / 1e6)
+            elif event["name"] in self.GAUGES: counters[event["name"]] = max(counters.get(event["name"], 0), event["args"]["value"])
+            else: counters[event["name"]] = counters.get(event["name"], 0) + event["args"]["value"]
+        for stage in stages.values(): stage["mean"] = stage["total"] / stage["count"]
+        return dict(sorted(stages.items(), key=lambda item: -item[1]["total"])), counters
+
+    def summary_lines(self):
+        stages, counters = self.summary()
+        lines = [f"{name}: {s['total']:.2f}s total, {s['count']}회, 평균 {s['mean']:.3f}s, 최대 {s['max']:.3f}s" for name, s in stages.items()]
+        lines += [f"{name}: {value}" + (" (최대)" if name in self.GAUGES else "") for name, value in counters.items()]
+        return lines
+
+# Shared by the scraper, the pool and export_results
+tracer = TRACER()